@@ -1,23 +1,46 @@
 import argparse
 import json
+import operator
 import os
+import re
+import signal
 import subprocess
 import sys
+import time
+from collections import namedtuple
+from contextlib import contextmanager
 from pathlib import Path
-from socket import create_connection
 
 
 class CommandResult:
     """Minimal subprocess result compatible with Python 3.6."""
 
-    def __init__(self, returncode, stdout, stderr):
+    def __init__(self, returncode, stdout, stderr, timed_out=False):
         self.returncode = returncode
         self.stdout = stdout
         self.stderr = stderr
+        self.timed_out = timed_out
 
 
-def run_command(command, env=None, capture_stderr=True):
-    """Run a subprocess and return a CommandResult with decoded text streams."""
+def _kill_process_group(process):
+    """Kill the child and everything it spawned (e.g. the JVM behind wlst.sh)."""
+
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:  # pragma: no cover - no process groups on Windows
+            process.kill()
+    except OSError:
+        pass
+
+
+def run_command(command, env=None, capture_stderr=True, timeout=None):
+    """Run a subprocess and return a CommandResult with decoded text streams.
+
+    With ``timeout`` the command runs in its own process group, which is
+    killed as a whole once the timeout expires; ``timed_out`` is then set and
+    whatever output was produced so far is returned.
+    """
 
     stderr_pipe = subprocess.PIPE if capture_stderr else None
     process = subprocess.Popen(
@@ -25,9 +48,21 @@ def run_command(command, env=None, capture_stderr=True):
         stdout=subprocess.PIPE,
         stderr=stderr_pipe,
         env=env,
+        start_new_session=timeout is not None and os.name == 'posix',
     )
 
-    stdout_data, stderr_data = process.communicate()
+    timed_out = False
+    try:
+        stdout_data, stderr_data = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _kill_process_group(process)
+        try:
+            stdout_data, stderr_data = process.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            # A grandchild escaped the group and still holds the pipes open.
+            process.kill()
+            stdout_data, stderr_data = b'', b''
 
     if isinstance(stdout_data, bytes):
         stdout_text = stdout_data.decode('utf-8', errors='replace')
@@ -39,51 +74,502 @@ def run_command(command, env=None, capture_stderr=True):
     else:
         stderr_text = stderr_data
 
-    return CommandResult(process.returncode, stdout_text, stderr_text)
+    return CommandResult(process.returncode, stdout_text, stderr_text, timed_out)
+
+
+def _children_cpu():
+    """CPU seconds used by waited-for child processes (e.g. WLST JVMs)."""
+
+    times = os.times()
+    return times.children_user + times.children_system
 
-try:
-    import psutil
-except ImportError:  # pragma: no cover - optional dependency
-    psutil = None
+
+class StageProfiler:
+    """Wall-clock and CPU time per stage and per check for ``--profile``.
+
+    Stages nest; entries are kept in start order with their nesting depth so
+    the summary reads like a call tree.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.depth = 0
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time() + _children_cpu()
+
+    @contextmanager
+    def stage(self, name, check=None):
+        entry = {'stage': name, 'check': check, 'depth': self.depth}
+        self.entries.append(entry)
+        self.depth += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time() + _children_cpu()
+        try:
+            yield entry
+        finally:
+            entry['wall'] = time.perf_counter() - wall_start
+            entry['cpu'] = time.process_time() + _children_cpu() - cpu_start
+            self.depth -= 1
+
+    def add(self, name, check, wall, cpu=None, parent=None):
+        """Record a stage measured elsewhere, such as inside the WLST script.
+
+        With ``parent`` the entry is nested under that earlier stage instead of
+        being appended at the current depth.
+        """
+
+        entry = {'stage': name, 'check': check, 'depth': self.depth, 'wall': wall, 'cpu': cpu}
+        if parent is None:
+            self.entries.append(entry)
+            return
+        entry['depth'] = parent['depth'] + 1
+        index = next(i for i, item in enumerate(self.entries) if item is parent) + 1
+        while index < len(self.entries) and self.entries[index]['depth'] > parent['depth']:
+            index += 1
+        self.entries.insert(index, entry)
+
+    def as_dict(self):
+        return {
+            'stages': self.entries,
+            'wallTotal': time.perf_counter() - self.started,
+            'cpuTotal': time.process_time() + _children_cpu() - self.cpu_started,
+        }
+
+    def summary_lines(self):
+        def millis(value):
+            return '-' if value is None else f"{value * 1000:.1f}"
+
+        lines = [f"{'Stage':<32} {'Check':<18} {'Wall ms':>10} {'CPU ms':>10}"]
+        for entry in self.entries:
+            label = '  ' * entry['depth'] + entry['stage']
+            lines.append(
+                f"{label:<32} {entry['check'] or '':<18} "
+                f"{millis(entry.get('wall')):>10} {millis(entry.get('cpu')):>10}"
+            )
+        totals = self.as_dict()
+        lines.append(
+            f"{'total':<32} {'':<18} {millis(totals['wallTotal']):>10} {millis(totals['cpuTotal']):>10}"
+        )
+        return lines
+
+
+_PROFILER = None
+
+
+@contextmanager
+def profile_stage(name, check=None):
+    """Time a stage when ``--profile`` is active; a no-op otherwise."""
+
+    if _PROFILER is None:
+        yield None
+        return
+    with _PROFILER.stage(name, check) as entry:
+        yield entry
+
+
+def record_wlst_timings(check, timings, run_entry):
+    """Fold the ``_timings`` section emitted by the WLST script into the profile.
+
+    JVM/WLST startup is whatever part of the subprocess wall time the script's
+    own ``total`` does not account for.
+    """
+
+    if _PROFILER is None or not isinstance(timings, dict) or run_entry is None:
+        return
+    total = timings.get('total')
+    if total is not None:
+        _PROFILER.add('jvm_startup', check, max(run_entry['wall'] - total, 0.0), parent=run_entry)
+    for name, seconds in timings.items():
+        if name != 'total':
+            _PROFILER.add(name, check, seconds, parent=run_entry)
+
+
+_MISSING = object()
+_psutil = _MISSING
+
+
+def load_psutil():
+    """Import psutil on first use so runs that never need it skip the import.
+
+    Returns None when the optional dependency is not installed.
+    """
+
+    global _psutil
+    if _psutil is _MISSING:
+        try:
+            import psutil
+        except ImportError:  # pragma: no cover - optional dependency
+            psutil = None
+        _psutil = psutil
+    return _psutil
+
+
+PROC_STAT_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+
+
+def read_proc_stat(path='/proc/stat'):
+    """Return the jiffy counters of the aggregate and per-core ``cpu`` lines."""
+
+    counters = {}
+    with open(path) as handle:
+        for line in handle:
+            if not line.startswith('cpu'):
+                break
+            parts = line.split()
+            values = [int(value) for value in parts[1:len(PROC_STAT_FIELDS) + 1]]
+            values.extend([0] * (len(PROC_STAT_FIELDS) - len(values)))
+            counters[parts[0]] = values
+    return counters
+
+
+def cpu_deltas(before, after):
+    """Compute usage, iowait and steal percentages between two snapshots.
+
+    A CPU with no jiffies counted in between (a window shorter than one clock
+    tick) gets None percentages rather than a misleading 0%.
+    """
+
+    idle_index = PROC_STAT_FIELDS.index('idle')
+    iowait_index = PROC_STAT_FIELDS.index('iowait')
+    steal_index = PROC_STAT_FIELDS.index('steal')
+
+    results = {}
+    for name, current in after.items():
+        previous = before.get(name)
+        if previous is None:
+            continue
+        deltas = [max(new - old, 0) for new, old in zip(current, previous)]
+        elapsed = sum(deltas)
+        if not elapsed:
+            results[name] = {'usage': None, 'iowait': None, 'steal': None}
+            continue
+        busy = elapsed - deltas[idle_index] - deltas[iowait_index]
+        results[name] = {
+            'usage': 100.0 * busy / elapsed,
+            'iowait': 100.0 * deltas[iowait_index] / elapsed,
+            'steal': 100.0 * deltas[steal_index] / elapsed,
+        }
+    return results
+
+
+class CpuSampler:
+    """Measure CPU utilisation from ``/proc/stat`` deltas instead of sleeping.
+
+    The baseline snapshot is taken when the sampler is created (at process
+    start) and every call to :meth:`sample` reports the interval since the
+    previous snapshot before starting a new one.
+    """
+
+    def __init__(self, path='/proc/stat'):
+        self.path = path
+        self._snapshot = None
+        self._taken_at = None
+        self.reset()
+
+    @property
+    def available(self):
+        return self._snapshot is not None
+
+    def reset(self):
+        try:
+            self._snapshot = read_proc_stat(self.path)
+        except (IOError, OSError, ValueError):
+            self._snapshot = None
+        self._taken_at = time.monotonic()
+
+    def sample(self):
+        """Return ``{'interval': seconds, 'cpus': {name: percentages}}`` or None."""
+
+        if self._snapshot is None:
+            return None
+        before, started = self._snapshot, self._taken_at
+        self.reset()
+        if self._snapshot is None:
+            return None
+        return {
+            'interval': self._taken_at - started,
+            'cpus': cpu_deltas(before, self._snapshot),
+        }
+
+
+_CPU_SAMPLER = None
+
+
+def cpu_sampler():
+    """Return the process-wide sampler, taking the baseline snapshot on first use."""
+
+    global _CPU_SAMPLER
+    if _CPU_SAMPLER is None:
+        _CPU_SAMPLER = CpuSampler()
+        if not _CPU_SAMPLER.available and load_psutil():
+            load_psutil().cpu_percent(interval=None)  # baseline for the non-blocking fallback
+    return _CPU_SAMPLER
 
 
 def check_os_cpu():
-    """Print the current CPU usage."""
-    if psutil:
-        usage = psutil.cpu_percent(interval=1)
-        cpus = psutil.cpu_count()
+    """Print CPU utilisation measured since process start (or the previous report).
+
+    Returns the measured percentages for rule evaluation.
+    """
+
+    result = cpu_sampler().sample()
+    if result and 'cpu' in result['cpus']:
+        cpus = result['cpus']
+        total = cpus['cpu']
+        cores = sorted((name for name in cpus if name != 'cpu'), key=lambda name: int(name[3:]))
+        measured = dict(total, interval=result['interval'], cores={core: cpus[core] for core in cores})
+        if total['usage'] is None:
+            # Reported as unmeasured instead of sleeping to lengthen the window.
+            measured['reason'] = f"sampling window of {result['interval']:.3f}s is shorter than one clock tick"
+            print(f"CPU usage: n/a ({len(cores)} cores) | {measured['reason']}")
+            return measured
+        print(
+            f"CPU usage: {total['usage']:.2f}% ({len(cores)} cores) | "
+            f"iowait {total['iowait']:.2f}% | steal {total['steal']:.2f}% | "
+            f"window {result['interval']:.2f}s"
+        )
+        for core in cores:
+            stats = cpus[core]
+            if stats['usage'] is None:
+                print(f"  {core}: n/a (no jiffies counted)")
+                continue
+            print(
+                f"  {core}: {stats['usage']:.2f}% "
+                f"(iowait {stats['iowait']:.2f}%, steal {stats['steal']:.2f}%)"
+            )
+        return measured
+    elif load_psutil():
+        psutil = load_psutil()
+        # Non-blocking: compares against the baseline call made by cpu_sampler().
+        usage = psutil.cpu_percent(interval=None)
+        print(f"CPU usage: {usage:.2f}% ({psutil.cpu_count()} cores)")
+        return {'usage': usage}
     else:
-        usage = os.getloadavg()[0] * 100 / (os.cpu_count() or 1)
-        cpus = os.cpu_count() or 1
-    print(f"CPU usage: {usage:.2f}% ({cpus} cores)")
+        load = os.getloadavg()[0]
+        print(
+            f"CPU load average (1m): {load:.2f} ({os.cpu_count() or 1} cores); "
+            "utilisation unavailable without /proc/stat or psutil"
+        )
+        return {'loadAverage': load}
+
+
+MemInfo = namedtuple(
+    'MemInfo',
+    ['total', 'available', 'free', 'buffers', 'cached', 'swap_total', 'swap_free'],
+)
+
+MEMINFO_FIELDS = {
+    'MemTotal': 'total',
+    'MemAvailable': 'available',
+    'MemFree': 'free',
+    'Buffers': 'buffers',
+    'Cached': 'cached',
+    'SwapTotal': 'swap_total',
+    'SwapFree': 'swap_free',
+}
+
+VMSTAT_SWAP_FIELDS = ('pswpin', 'pswpout')
+
+
+def read_meminfo(path='/proc/meminfo'):
+    """Parse ``/proc/meminfo`` in a single pass into a :class:`MemInfo` (kB values).
+
+    ``available`` is None on kernels that predate ``MemAvailable``.
+    """
+
+    values = dict.fromkeys(MemInfo._fields)
+    with open(path) as handle:
+        for line in handle:
+            key, _, rest = line.partition(':')
+            field = MEMINFO_FIELDS.get(key)
+            if field:
+                values[field] = int(rest.split()[0])
+    for field in values:
+        if values[field] is None and field != 'available':
+            values[field] = 0
+    return MemInfo(**values)
+
+
+def read_vmstat(path='/proc/vmstat', fields=VMSTAT_SWAP_FIELDS):
+    """Return the requested cumulative counters from ``/proc/vmstat``."""
+
+    counters = {}
+    with open(path) as handle:
+        for line in handle:
+            key, _, value = line.partition(' ')
+            if key in fields:
+                counters[key] = int(value)
+    return counters
+
+
+def read_pressure(path='/proc/pressure/memory'):
+    """Return PSI stall percentages as ``{'some': {...}, 'full': {...}}`` or None."""
+
+    try:
+        with open(path) as handle:
+            lines = handle.read().splitlines()
+    except (IOError, OSError):
+        return None
+
+    pressure = {}
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        metrics = {}
+        for item in parts[1:]:
+            key, _, value = item.partition('=')
+            if key.startswith('avg'):
+                metrics[key] = float(value)
+        pressure[parts[0]] = metrics
+    return pressure
+
+
+class SwapSampler:
+    """Compute swap-in/out page rates from ``/proc/vmstat`` deltas.
+
+    Like :class:`CpuSampler`, the baseline is taken at process start and every
+    :meth:`sample` reports the rate since the previous snapshot.
+    """
+
+    def __init__(self, path='/proc/vmstat'):
+        self.path = path
+        self._snapshot = None
+        self._taken_at = None
+        self.reset()
+
+    @property
+    def available(self):
+        return self._snapshot is not None
+
+    def reset(self):
+        try:
+            self._snapshot = read_vmstat(self.path)
+        except (IOError, OSError, ValueError):
+            self._snapshot = None
+        self._taken_at = time.monotonic()
+
+    def sample(self):
+        """Return ``{'interval': seconds, 'pswpin': rate, 'pswpout': rate}`` or None."""
+
+        if self._snapshot is None:
+            return None
+        before, started = self._snapshot, self._taken_at
+        self.reset()
+        if self._snapshot is None:
+            return None
+        interval = self._taken_at - started
+        rates = {'interval': interval}
+        for field in VMSTAT_SWAP_FIELDS:
+            delta = max(self._snapshot.get(field, 0) - before.get(field, 0), 0)
+            rates[field] = delta / interval if interval > 0 else 0.0
+        return rates
+
+
+_SWAP_SAMPLER = None
+
+
+def swap_sampler():
+    """Return the process-wide swap sampler, taking the baseline on first use."""
+
+    global _SWAP_SAMPLER
+    if _SWAP_SAMPLER is None:
+        _SWAP_SAMPLER = SwapSampler()
+    return _SWAP_SAMPLER
 
 
 def check_os_memory():
-    """Print the current memory usage."""
-    if psutil:
+    """Print available memory, swap activity and memory pressure stalls.
+
+    Returns the figures (MB, pages/s and PSI percentages) for rule evaluation.
+    """
+
+    try:
+        meminfo = read_meminfo()
+    except (IOError, OSError, ValueError):
+        meminfo = None
+
+    if meminfo is None or not meminfo.total:
+        psutil = load_psutil()
+        if not psutil:
+            print("Memory usage unavailable without /proc/meminfo or psutil")
+            return
         mem = psutil.virtual_memory()
-        total = mem.total / (1024 * 1024)
-        usage = mem.percent
-    else:
-        meminfo = {}
-        with open('/proc/meminfo') as f:
-            for line in f:
-                key, value = line.split(':')
-                meminfo[key] = int(value.strip().split()[0])
-        total = meminfo['MemTotal'] / 1024
-        free = (meminfo.get('MemFree', 0) + meminfo.get('Buffers', 0) + meminfo.get('Cached', 0)) / 1024
-        usage = 100 * (1 - free / total)
-    print(f"Memory usage: {usage:.2f}% of {total:.0f}MB")
+        swap = psutil.swap_memory()
+        print(
+            f"Memory usage: {mem.percent:.2f}% of {mem.total / (1024 * 1024):.0f}MB "
+            f"(available {mem.available / (1024 * 1024):.0f}MB)"
+        )
+        print(f"  Swap: {swap.used / (1024 * 1024):.0f}MB/{swap.total / (1024 * 1024):.0f}MB used")
+        return {
+            'usagePercent': mem.percent,
+            'totalMB': mem.total / (1024 * 1024),
+            'availableMB': mem.available / (1024 * 1024),
+            'swapUsedMB': swap.used / (1024 * 1024),
+            'swapTotalMB': swap.total / (1024 * 1024),
+        }
+
+    available = meminfo.available
+    estimate = ''
+    if available is None:
+        # Pre-3.14 kernels: page cache is only partly reclaimable, so this is an upper bound.
+        available = meminfo.free + meminfo.buffers + meminfo.cached
+        estimate = ', estimated'
+    usage = 100.0 * (1 - available / meminfo.total)
+    print(
+        f"Memory usage: {usage:.2f}% of {meminfo.total / 1024:.0f}MB "
+        f"(available {available / 1024:.0f}MB{estimate})"
+    )
+
+    summary = {
+        'usagePercent': usage,
+        'totalMB': meminfo.total / 1024,
+        'availableMB': available / 1024,
+    }
+
+    swap_used = meminfo.swap_total - meminfo.swap_free
+    summary['swapUsedMB'] = swap_used / 1024
+    summary['swapTotalMB'] = meminfo.swap_total / 1024
+    swap_line = f"  Swap: {swap_used / 1024:.0f}MB/{meminfo.swap_total / 1024:.0f}MB used"
+    rates = swap_sampler().sample()
+    if rates:
+        summary['swapInRate'] = rates['pswpin']
+        summary['swapOutRate'] = rates['pswpout']
+        swap_line += (
+            f" | in {rates['pswpin']:.1f} pages/s | out {rates['pswpout']:.1f} pages/s"
+            f" | window {rates['interval']:.2f}s"
+        )
+    print(swap_line)
+
+    pressure = read_pressure()
+    if pressure:
+        summary['pressure'] = pressure
+        parts = []
+        for kind in ('some', 'full'):
+            metrics = pressure.get(kind)
+            if metrics:
+                parts.append(
+                    f"{kind} avg10={metrics.get('avg10', 0.0):.2f}% "
+                    f"avg60={metrics.get('avg60', 0.0):.2f}% "
+                    f"avg300={metrics.get('avg300', 0.0):.2f}%"
+                )
+        if parts:
+            print(f"  Pressure: {' | '.join(parts)}")
+    return summary
 
 
 def check_servers(names):
     """Check if server processes are running."""
+    processes = {}
     for name in names:
         result = run_command(['pgrep', '-fl', name], capture_stderr=False)
-        if result.stdout.strip():
+        running = bool(result.stdout.strip())
+        processes[name] = {'running': running}
+        if running:
             print(f"Server '{name}' is running")
         else:
             print(f"Server '{name}' is NOT running")
+    return processes
 
 
 def placeholder(message):
@@ -110,14 +596,74 @@ def iter_named_items(value, default_key='name'):
             yield None, payload
 
 
+_WLST_RESULTS = {}
+# WLST check -> (status, message) of its last failed run: 'unavailable', 'skipped', 'timeout' or 'error'.
+_WLST_FAILURES = {}
+
+DEFAULT_CHECK_TIMEOUT = 300
+
+
+def run_deadline_remaining(args):
+    """Seconds left before the run deadline, or None when no run timeout is set."""
+
+    deadline = getattr(args, 'deadline', None)
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def wlst_timeout(args):
+    """Per-check WLST timeout, shortened so it never outlives the run deadline."""
+
+    timeout = getattr(args, 'check_timeout', None) or DEFAULT_CHECK_TIMEOUT
+    remaining = run_deadline_remaining(args)
+    if remaining is not None:
+        timeout = min(timeout, remaining)
+    return timeout
+
+
 def run_wlst(check, args):
-    """Invoke the configured WLST script and return the JSON payload it emits."""
+    """Invoke the configured WLST script and return the JSON payload it emits.
+
+    Successful payloads are kept for the rest of the run so checks sharing a
+    section (e.g. ``managed_servers`` and ``endpoints``) start WLST only once.
+    """
+
+    if check in _WLST_RESULTS:
+        return _WLST_RESULTS[check]
+    data = _run_wlst(check, args)
+    if data:
+        _WLST_RESULTS[check] = data
+        _WLST_FAILURES.pop(check, None)
+    elif check not in _WLST_FAILURES:
+        _WLST_FAILURES[check] = ('error', 'WLST returned no data')
+    return data
+
+
+def wlst_failed(check, status, message):
+    """Record why a WLST check produced no data, for the ``--json`` check statuses."""
+
+    _WLST_FAILURES[check] = (status, message)
+
+
+# Printed by wlst_health_checks.connect_if_available when WLST cannot reach the admin server.
+WLST_CONNECT_ERROR = 'Failed to connect via WLST'
+
+
+def _run_wlst(check, args):
 
     exec_path = getattr(args, 'wlst_path', None) or getattr(args, 'wlst_exec', None)
     script_path = args.wlst_script
 
+    _WLST_FAILURES.pop(check, None)
     if not script_path or not exec_path:
         placeholder(check.title())
+        wlst_failed(check, 'unavailable', 'no WLST executable or script configured')
+        return None
+
+    if not admin_preflight(args):
+        _, message, status = _PREFLIGHT[domain_key(args)]
+        wlst_failed(check, status, message)
         return None
 
     script_path = str(Path(script_path).expanduser().resolve())
@@ -135,23 +681,62 @@ def run_wlst(check, args):
     env = os.environ.copy()
     if args.wlst_sample_output:
         env['WLST_SAMPLE_OUTPUT'] = args.wlst_sample_output
+    if _PROFILER is not None:
+        env['WLST_PROFILE'] = '1'
+    if getattr(args, 'mbean_stats', False):
+        env['WLST_STATS'] = '1'
+    if getattr(args, 'thread_dumps', False):
+        env['WLST_THREAD_DUMP_DIR'] = str(state_dir(args) / 'thread-dumps')
+        for key, variable in THREAD_DUMP_ENV.items():
+            if getattr(args, key, None) is not None:
+                env[variable] = str(getattr(args, key))
+
+    timeout = wlst_timeout(args)
+    if timeout is not None and timeout <= 0:
+        print(f"[TIMEOUT] WLST check '{check}' not started: run deadline of {args.run_timeout:g}s reached")
+        wlst_failed(check, 'timeout', f"not started: run deadline of {args.run_timeout:g}s reached")
+        return None
 
     try:
-        result = run_command(command, env=env)
+        with profile_stage('wlst.run', check) as run_entry:
+            result = run_command(command, env=env, timeout=timeout)
     except FileNotFoundError as exc:
         print(f"[ERROR] WLST executable '{exec_path}' not found: {exc}")
+        wlst_failed(check, 'error', f"WLST executable '{exec_path}' not found")
+        return None
+
+    if result.timed_out:
+        print(f"[TIMEOUT] WLST check '{check}' exceeded {timeout:.1f}s; process group killed")
+        wlst_failed(check, 'timeout', f"exceeded {timeout:.1f}s; process group killed")
         return None
 
     if result.returncode != 0:
-        print(f"[ERROR] WLST returned {result.returncode}: {result.stderr.strip() or result.stdout.strip()}")
+        reason = result.stderr.strip() or result.stdout.strip()
+        print(f"[ERROR] WLST returned {result.returncode}: {reason}")
+        # Only a failed connect() says the domain is down; script errors must not open the circuit.
+        connect_failed = WLST_CONNECT_ERROR in result.stdout
+        record_domain_result(args, not connect_failed, reason if connect_failed else None)
+        wlst_failed(check, 'error', f"WLST returned {result.returncode}: {reason}")
         return None
+    record_domain_result(args, True)
 
     payload = result.stdout.strip() or result.stderr.strip()
     if not payload:
         print("[ERROR] WLST script produced no output")
+        wlst_failed(check, 'error', 'WLST script produced no output')
         return None
 
-    # WLST may emit log lines. Locate the final JSON structure.
+    with profile_stage('wlst.decode', check):
+        data = decode_wlst_output(payload)
+    if isinstance(data, dict):
+        record_wlst_timings(check, data.pop('_timings', None), run_entry)
+        merge_mbean_stats(data.pop('_stats', None))
+    return data
+
+
+def decode_wlst_output(payload):
+    """Return the final JSON document in WLST output, which may include log lines."""
+
     for line in reversed(payload.splitlines()):
         candidate = line.strip()
         if candidate.startswith('{') or candidate.startswith('['):
@@ -167,12 +752,56 @@ def run_wlst(check, args):
         return None
 
 
+_MBEAN_STATS = {}
+
+# Config keys forwarded to the WLST collector's thread-dump capture.
+THREAD_DUMP_ENV = {
+    'thread_dump_interval': 'WLST_THREAD_DUMP_INTERVAL',
+    'thread_dump_hogging': 'WLST_THREAD_DUMP_HOGGING',
+    'thread_dump_max_bytes': 'WLST_THREAD_DUMP_MAX_BYTES',
+    'thread_dump_max_total': 'WLST_THREAD_DUMP_MAX_TOTAL',
+}
+
+
+def merge_mbean_stats(stats):
+    """Accumulate the per-MBean-attribute ``_stats`` section of a WLST payload."""
+
+    if not isinstance(stats, dict):
+        return
+    for mbean_type, attributes in stats.items():
+        for attribute, values in (attributes or {}).items():
+            totals = _MBEAN_STATS.setdefault(
+                (mbean_type, attribute), {'calls': 0, 'errors': 0, 'total': 0.0, 'max': 0.0}
+            )
+            totals['calls'] += values.get('calls', 0)
+            totals['errors'] += values.get('errors', 0)
+            totals['total'] += values.get('total', 0.0)
+            totals['max'] = max(totals['max'], values.get('max', 0.0))
+
+
+def mbean_stats_lines():
+    """Format the accumulated MBean call statistics, slowest attributes first."""
+
+    lines = [
+        f"{'MBean type':<26} {'Attribute':<34} {'Calls':>7} {'Errors':>7} "
+        f"{'Total ms':>10} {'Avg ms':>8} {'Max ms':>8}"
+    ]
+    ordered = sorted(_MBEAN_STATS.items(), key=lambda item: -item[1]['total'])
+    for (mbean_type, attribute), stats in ordered:
+        average = stats['total'] / stats['calls'] if stats['calls'] else 0.0
+        lines.append(
+            f"{mbean_type:<26} {attribute:<34} {stats['calls']:>7} {stats['errors']:>7} "
+            f"{stats['total'] * 1000:>10.1f} {average * 1000:>8.2f} {stats['max'] * 1000:>8.2f}"
+        )
+    return lines
+
+
 def check_cluster(args):
     """Check cluster state via WLST."""
 
     data = run_wlst('cluster', args)
     if not data:
-        return
+        return None
 
     clusters = data.get('clusters') or data.get('items', {})
     if not clusters:
@@ -185,6 +814,7 @@ def check_cluster(args):
             health = server.get('health')
             details = f" (health: {health})" if health else ''
             print(f"  Member {server_name}: {server_state}{details}")
+    return clusters
 
 
 def check_managed_servers(args):
@@ -192,9 +822,10 @@ def check_managed_servers(args):
 
     data = run_wlst('managed_servers', args)
     if not data:
-        return
+        return None
 
     servers = data.get('servers') or data.get('items', {})
+    add_gc_overhead(args, servers)
     for name, server in iter_named_items(servers):
         state = server.get('state') or server.get('status')
         health = server.get('health')
@@ -213,6 +844,83 @@ def check_managed_servers(args):
         port = server.get('listenPort')
         endpoint = f" | {address}:{port}" if address or port else ''
         print(f"Server {name}: {state}{health_info}{cluster_info}{endpoint}{heap_info}")
+        jvm_info = format_jvm_metrics(server)
+        if jvm_info:
+            print(f"  JVM: {jvm_info}")
+    return servers
+
+
+def add_gc_overhead(args, servers):
+    """Set ``gcOverheadPercent`` on each server from GC time between two samples.
+
+    The previous sample's JVM uptime and total collection time are kept per
+    domain; after a restart, or on the first run, the lifetime average since
+    JVM start is reported instead (``gcWindowSeconds`` is then None).
+    """
+
+    path = domain_state_file(args, 'gc')
+    try:
+        previous = json.loads(path.read_text())
+    except (IOError, OSError, ValueError):
+        previous = {}
+    if not isinstance(previous, dict):
+        previous = {}
+
+    current = {}
+    for name, server in iter_named_items(servers):
+        if not isinstance(server, dict):
+            continue
+        collectors = server.get('gc')
+        uptime = server.get('uptime')
+        if not isinstance(collectors, dict) or not uptime:
+            continue
+        gc_time = sum(
+            collector.get('collectionTime') or 0
+            for collector in collectors.values()
+            if isinstance(collector, dict)
+        )
+        current[name] = {'uptime': uptime, 'gcTime': gc_time}
+        before = previous.get(name) or {}
+        if before.get('uptime') is not None and uptime > before['uptime']:
+            window = uptime - before['uptime']
+            server['gcOverheadPercent'] = 100.0 * max(gc_time - before.get('gcTime', 0), 0) / window
+            server['gcWindowSeconds'] = window / 1000.0
+        else:
+            server['gcOverheadPercent'] = 100.0 * gc_time / uptime
+            server['gcWindowSeconds'] = None
+
+    if current:
+        try:
+            write_json_atomic(path, current)
+        except (IOError, OSError) as exc:
+            print(f"[WARN] Unable to persist GC samples to {path}: {exc}")
+
+
+def format_jvm_metrics(server):
+    """One-line summary of heap free, GC overhead and counters, CPU load and uptime."""
+
+    parts = []
+    if server.get('heapFreePercent') is not None:
+        parts.append(f"heap free {server['heapFreePercent']}%")
+    if server.get('gcOverheadPercent') is not None:
+        window = server.get('gcWindowSeconds')
+        span = f"last {window / 60:.1f} min" if window else 'since start'
+        parts.append(f"GC overhead {server['gcOverheadPercent']:.2f}% ({span})")
+    if server.get('processCpuLoad') is not None:
+        parts.append(f"process CPU {float(server['processCpuLoad']) * 100:.1f}%")
+    if server.get('uptime'):
+        minutes, _ = divmod(int(server['uptime']) // 1000, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        parts.append(f"uptime {days}d {hours:02d}:{minutes:02d}")
+    collectors = server.get('gc')
+    if isinstance(collectors, dict) and collectors:
+        parts.append(', '.join(
+            f"{collector} {stats.get('collectionCount')}x/{(stats.get('collectionTime') or 0) / 1000:.1f}s"
+            for collector, stats in collectors.items()
+            if isinstance(stats, dict)
+        ))
+    return ' | '.join(parts)
 
 
 def check_jms(args):
@@ -220,9 +928,10 @@ def check_jms(args):
 
     data = run_wlst('jms', args)
     if not data:
-        return
+        return None
 
-    for name, jms in iter_named_items(data.get('jmsServers') or data.get('items', {})):
+    jms_servers = data.get('jmsServers') or data.get('items', {})
+    for name, jms in iter_named_items(jms_servers):
         state = jms.get('state') or jms.get('health') or jms.get('healthState', {}).get('state')
         print(f"JMS Server {name}: {state}")
         for dest_name, destination in iter_named_items(jms.get('destinations')):
@@ -240,6 +949,7 @@ def check_jms(args):
             metrics_str = f" ({', '.join(metrics)})" if metrics else ''
             type_str = f"[{dest_type}] " if dest_type else ''
             print(f"  {type_str}{dest_name}{metrics_str}")
+    return jms_servers
 
 
 def check_threads(args):
@@ -247,12 +957,12 @@ def check_threads(args):
 
     data = run_wlst('threads', args)
     if not data:
-        return
+        return None
 
     pools = data.get('threads') or data.get('threadPools') or data.get('items', {})
     if not pools:
         print("No thread pool data returned")
-        return
+        return pools
 
     for server_key, pool in iter_named_items(pools, default_key='server'):
         server = server_key or pool.get('server') or pool.get('name')
@@ -283,19 +993,104 @@ def check_threads(args):
         metrics_str = ', '.join(metrics) if metrics else 'No metrics reported'
         print(f"Thread pool {server or 'unknown'}: {metrics_str}")
 
+        dump = pool.get('threadDump')
+        if dump:
+            if dump.get('error'):
+                print(f"  Thread dump: {dump['error']}")
+            elif dump.get('skipped'):
+                print(f"  Thread dump: skipped ({dump['skipped']}), last capture {dump.get('path')}")
+            else:
+                notes = [dump.get('reason') or 'captured']
+                if dump.get('deduplicated'):
+                    notes.append('identical to an earlier dump')
+                if dump.get('truncated'):
+                    notes.append(f"truncated to {dump.get('bytes')} bytes")
+                print(f"  Thread dump: {dump.get('path')} ({', '.join(notes)})")
+    return pools
+
+
+DATASOURCE_EXHAUSTION_PERCENT = 90
+
+
+def assess_pool(pool, threshold=DATASOURCE_EXHAUSTION_PERCENT):
+    """Add ``utilizationPercent`` and ``nearExhaustion`` to a per-server pool entry.
+
+    A pool is close to exhaustion when its active connections reach
+    ``threshold`` percent of ``maxCapacity`` or callers are already waiting.
+    """
+
+    active = pool.get('activeConnectionsCurrentCount')
+    limit = pool.get('maxCapacity')
+    reasons = []
+    if active is not None and limit:
+        pool['utilizationPercent'] = round(active * 100.0 / limit, 1)
+        if pool['utilizationPercent'] >= threshold:
+            reasons.append(f"{active}/{limit} connections in use")
+    if pool.get('waitingForConnectionCurrentCount'):
+        reasons.append(f"{pool['waitingForConnectionCurrentCount']} waiting for a connection")
+    pool['nearExhaustion'] = bool(reasons)
+    return reasons
+
+
+def format_pool_metrics(pool):
+    """One-line summary of capacity, waiters, leaks and reserve failures."""
+
+    parts = []
+    active = pool.get('activeConnectionsCurrentCount')
+    if active is not None:
+        usage = f"Active {active}"
+        if pool.get('maxCapacity'):
+            usage += f"/{pool['maxCapacity']}"
+            if pool.get('utilizationPercent') is not None:
+                usage += f" ({pool['utilizationPercent']:g}%)"
+        if pool.get('activeConnectionsHighCount') is not None:
+            usage += f", high {pool['activeConnectionsHighCount']}"
+        parts.append(usage)
+    if pool.get('currCapacity') is not None:
+        capacity = f"capacity {pool['currCapacity']}"
+        if pool.get('numAvailable') is not None:
+            capacity += f" ({pool['numAvailable']} available)"
+        parts.append(capacity)
+    if pool.get('waitingForConnectionCurrentCount') is not None:
+        parts.append(
+            f"waiting {pool['waitingForConnectionCurrentCount']}"
+            f" (high {pool.get('waitingForConnectionHighCount')}, max wait {pool.get('waitSecondsHighCount')}s)"
+        )
+    for key, label in (
+        ('leakedConnectionCount', 'leaked'),
+        ('failedReserveRequestCount', 'failed reserves'),
+    ):
+        if pool.get(key) is not None:
+            parts.append(f"{label} {pool[key]}")
+    if pool.get('connectionDelayTime') is not None:
+        parts.append(f"connect delay {pool['connectionDelayTime']}ms")
+    return ' | '.join(parts)
+
 
 def check_datasource(args):
     """Check JDBC data sources via WLST."""
 
     data = run_wlst('datasource', args)
     if not data:
-        return
+        return None
 
-    for name, ds in iter_named_items(data.get('datasources') or data.get('items', {})):
+    threshold = getattr(args, 'datasource_exhaustion_percent', None) or DATASOURCE_EXHAUSTION_PERCENT
+    datasources = data.get('datasources') or data.get('items', {})
+    for name, ds in iter_named_items(datasources):
         state = ds.get('state') or ds.get('status') or ds.get('stateReturn')
         active = ds.get('activeConnectionsCurrentCount')
         additional = f", Active={active}" if active is not None else ''
         print(f"Datasource {name}: {state}{additional}")
+        servers = ds.get('servers')
+        if not isinstance(servers, dict):
+            continue
+        for server, pool in servers.items():
+            if not isinstance(pool, dict):
+                continue
+            reasons = assess_pool(pool, threshold)
+            flag = f" [NEAR EXHAUSTION: {'; '.join(reasons)}]" if reasons else ''
+            print(f"  {server}: {format_pool_metrics(pool)}{flag}")
+    return datasources
 
 
 def check_deployments(args):
@@ -303,11 +1098,13 @@ def check_deployments(args):
 
     data = run_wlst('deployments', args)
     if not data:
-        return
+        return None
 
-    for name, app in iter_named_items(data.get('deployments') or data.get('items', {})):
+    deployments = data.get('deployments') or data.get('items', {})
+    for name, app in iter_named_items(deployments):
         state = app.get('state') or app.get('status') or app.get('stateReturn')
         print(f"Deployment {name}: {state}")
+    return deployments
 
 
 def check_composites(args):
@@ -315,7 +1112,7 @@ def check_composites(args):
 
     data = run_wlst('composites', args)
     if not data:
-        return
+        return None
 
     composites = data.get('composites') or data.get('items', {})
     for name, composite in iter_named_items(composites):
@@ -326,26 +1123,817 @@ def check_composites(args):
         prefix = f"{partition}/" if partition else ''
         version_info = f" (version {version})" if version else ''
         print(f"Composite {prefix}{composite_name}: {state}{version_info}")
+    return composites
+
+
+PROBE_TIMEOUT = 5.0
+PROBE_CONCURRENCY = 64
+
+DEFAULT_URL_PORTS = {'http': 80, 'https': 443, 't3': 7001, 't3s': 7002, 'iiop': 7001, 'iiops': 7002}
+
+ProbeTarget = namedtuple('ProbeTarget', ['kind', 'name', 'host', 'port', 'timeout'])
+ProbeResult = namedtuple('ProbeResult', ['target', 'ok', 'latency', 'error'])
+
+
+def parse_endpoint(value, default_port=None):
+    """Split ``scheme://host:port``, ``host:port`` or ``host`` into ``(host, port)``."""
+
+    value = (value or '').strip()
+    if not value:
+        return None, None
+    if '://' in value:
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(value)
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        return parts.hostname, port or DEFAULT_URL_PORTS.get(parts.scheme.lower(), default_port)
+    host, sep, port = value.rpartition(':')
+    if sep and port.isdigit():
+        return host, int(port)
+    return value, default_port
+
+
+def probe_timeout(args, kind, name, host, port):
+    """Resolve a per-target timeout: ``host:port``, then name, then kind, then the default."""
+
+    overrides = getattr(args, 'probe_timeouts', None) or {}
+    for key in (f"{host}:{port}", name, kind):
+        if key in overrides:
+            return float(overrides[key])
+    return getattr(args, 'probe_timeout', None) or PROBE_TIMEOUT
 
 
-def check_ldap(host, port):
-    """Check if LDAP host is reachable."""
+async def _probe_target(target, semaphore):
+    import asyncio
+
+    async with semaphore:
+        started = time.monotonic()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(target.host, target.port), target.timeout
+            )
+        except asyncio.TimeoutError:
+            return ProbeResult(
+                target, False, time.monotonic() - started, f"timed out after {target.timeout:g}s"
+            )
+        except (OSError, ValueError) as exc:
+            return ProbeResult(target, False, time.monotonic() - started, str(exc))
+        latency = time.monotonic() - started
+        writer.close()
+        return ProbeResult(target, True, latency, None)
+
+
+async def _probe_all(targets, concurrency):
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(_probe_target(target, semaphore) for target in targets))
+
+
+def probe_endpoints(targets, concurrency=PROBE_CONCURRENCY):
+    """Open TCP connections to all targets concurrently; results keep input order."""
+
+    if not targets:
+        return []
+    # asyncio is the slowest import of the tool; only endpoint probes pay for it.
+    import asyncio
+
+    loop = asyncio.new_event_loop()
     try:
-        with create_connection((host, port), timeout=5):
-            print(f"LDAP service {host}:{port} reachable")
-    except Exception as exc:
-        print(f"LDAP service {host}:{port} unreachable: {exc}")
+        return loop.run_until_complete(_probe_all(targets, concurrency))
+    finally:
+        loop.close()
+
 
+def probe_summary(result):
+    """Structured form of a probe result for rule evaluation."""
 
-def load_config(path):
-    """Load configuration from a JSON or YAML file."""
+    return {
+        'host': result.target.host,
+        'port': result.target.port,
+        'reachable': result.ok,
+        'latencyMs': result.latency * 1000,
+        'error': result.error,
+    }
+
+
+def format_probe(result):
+    target = result.target
+    if result.ok:
+        return f"{target.host}:{target.port} reachable ({result.latency * 1000:.1f} ms)"
+    return f"{target.host}:{target.port} unreachable: {result.error}"
+
+
+def ldap_targets(args):
+    """Build probe targets for every configured LDAP host (``host`` or ``host:port``)."""
+
+    targets = []
+    for entry in (args.ldap_host or '').split(','):
+        host, port = parse_endpoint(entry, args.ldap_port)
+        if host:
+            timeout = probe_timeout(args, 'ldap', host, host, port)
+            targets.append(ProbeTarget('ldap', host, host, port, timeout))
+    return targets
+
+
+def admin_target(args):
+    host, port = parse_endpoint(args.admin_url)
+    if not host or not port:
+        return None
+    return ProbeTarget('admin', 'admin', host, port, probe_timeout(args, 'admin', 'admin', host, port))
+
+
+def server_targets(args, data):
+    """Build probe targets from the ``listenAddress``/``listenPort`` WLST fields."""
+
+    targets = []
+    skipped = []
+    servers = (data or {}).get('servers') or (data or {}).get('items', {})
+    for name, server in iter_named_items(servers):
+        host = server.get('listenAddress')
+        port = server.get('listenPort')
+        if not host or not port:
+            skipped.append(name)
+            continue
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            skipped.append(name)
+            continue
+        timeout = probe_timeout(args, 'server', name, host, port)
+        targets.append(ProbeTarget('server', name, host, port, timeout))
+    return targets, skipped
+
+
+def check_ldap(args):
+    """Check that every configured LDAP host is reachable."""
+
+    summary = {}
+    for result in probe_endpoints(ldap_targets(args)):
+        print(f"LDAP service {format_probe(result)}")
+        summary[f"{result.target.host}:{result.target.port}"] = probe_summary(result)
+    return summary
+
+
+def check_endpoints(args):
+    """Probe the admin server, LDAP hosts and all managed server listen endpoints."""
+
+    targets = []
+    admin = admin_target(args)
+    if admin:
+        targets.append(admin)
+    targets.extend(ldap_targets(args))
+
+    skipped = []
+    if getattr(args, 'wlst_script', None):
+        data = run_wlst('managed_servers', args)
+        servers, skipped = server_targets(args, data)
+        targets.extend(servers)
+
+    if not targets:
+        print("No endpoints configured to probe")
+        return None
+
+    started = time.monotonic()
+    results = probe_endpoints(targets)
+    elapsed = time.monotonic() - started
+
+    for result in results:
+        target = result.target
+        label = target.kind if target.name == target.kind else f"{target.kind} {target.name}"
+        print(f"Endpoint {label}: {format_probe(result)}")
+    for name in skipped:
+        print(f"Endpoint server {name}: skipped (no listen address/port reported)")
+    reachable = sum(1 for result in results if result.ok)
+    print(f"{reachable}/{len(results)} endpoints reachable (probed in {elapsed:.2f}s)")
+
+    summary = {}
+    for result in results:
+        summary.setdefault(result.target.kind, {})[result.target.name] = probe_summary(result)
+    return summary
+
+
+DEFAULT_STATE_DIR = Path('~/.cache/middleware_healthcheck')
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 300
+
+
+def state_dir(args):
+    """Directory for state kept between runs (circuit breaker, samples, ...)."""
+
+    return Path(getattr(args, 'state_dir', None) or DEFAULT_STATE_DIR).expanduser()
+
+
+def write_json_atomic(path, data, mode=None):
+    """Write JSON via a temporary file and rename so readers never see partial state."""
+
+    path = Path(path)
+    text = json.dumps(data, indent=2, sort_keys=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(text)
+    if mode is not None:
+        os.chmod(str(temp_path), mode)
+    os.replace(str(temp_path), str(path))
+
+
+class CircuitBreaker:
+    """Per-domain failure memory persisted across runs.
+
+    After ``threshold`` consecutive failures a domain's circuit opens and WLST
+    work is skipped without even a preflight until ``cooldown`` seconds have
+    passed; the next attempt then acts as a half-open trial.
+    """
+
+    def __init__(self, path, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.cooldown = cooldown
+        try:
+            self.domains = json.loads(self.path.read_text())
+        except (IOError, OSError, ValueError):
+            self.domains = {}
+        if not isinstance(self.domains, dict):
+            self.domains = {}
+
+    def open_until(self, domain):
+        """Return the epoch time the circuit re-closes, or None if it is closed."""
+
+        entry = self.domains.get(domain) or {}
+        if entry.get('failures', 0) < self.threshold:
+            return None
+        retry_at = entry.get('lastFailure', 0) + self.cooldown
+        return retry_at if retry_at > time.time() else None
+
+    def record_failure(self, domain, reason):
+        entry = self.domains.setdefault(domain, {})
+        entry['failures'] = entry.get('failures', 0) + 1
+        entry['lastFailure'] = time.time()
+        entry['reason'] = reason
+        self.save()
+
+    def record_success(self, domain):
+        if self.domains.pop(domain, None) is not None:
+            self.save()
+
+    def save(self):
+        try:
+            write_json_atomic(self.path, self.domains)
+        except (IOError, OSError) as exc:
+            print(f"[WARN] Unable to persist circuit breaker state to {self.path}: {exc}")
+
+
+_BREAKER = None
+_PREFLIGHT = {}
+
+
+def circuit_breaker(args):
+    global _BREAKER
+    if _BREAKER is None:
+        _BREAKER = CircuitBreaker(
+            state_dir(args) / 'circuit_breaker.json',
+            threshold=getattr(args, 'breaker_threshold', None) or BREAKER_THRESHOLD,
+            cooldown=getattr(args, 'breaker_cooldown', None) or BREAKER_COOLDOWN,
+        )
+    return _BREAKER
+
+
+def domain_key(args):
+    """Identify a domain by its admin URL; sample replays have no live domain."""
+
+    if getattr(args, 'wlst_sample_output', None) or not args.admin_url:
+        return None
+    return args.admin_url
+
+
+def domain_state_file(args, kind):
+    """Per-domain state file under ``<state dir>/<kind>``; sample replays get their own."""
+
+    import hashlib
+
+    source = domain_key(args) or getattr(args, 'wlst_sample_output', None) or 'local'
+    digest = hashlib.sha1(str(source).encode('utf-8')).hexdigest()[:16]
+    return state_dir(args) / kind / f"{digest}.json"
+
+
+def record_domain_result(args, ok, reason=None):
+    domain = domain_key(args)
+    if domain is None:
+        return
+    if ok:
+        circuit_breaker(args).record_success(domain)
+    else:
+        circuit_breaker(args).record_failure(domain, reason)
+
+
+def admin_preflight(args):
+    """Return True when WLST may be started for the configured domain.
+
+    The decision is made once per run: an open circuit fails fast, otherwise a
+    TCP connect to the admin URL must succeed before any ``wlst.sh`` is spawned.
+    """
+
+    domain = domain_key(args)
+    if domain is None:
+        return True
+    if domain in _PREFLIGHT:
+        ok, message, _ = _PREFLIGHT[domain]
+        if not ok:
+            print(f"[SKIPPED] {message}")
+        return ok
+
+    breaker = circuit_breaker(args)
+    retry_at = breaker.open_until(domain)
+    if retry_at is not None:
+        entry = breaker.domains[domain]
+        message = (
+            f"Circuit open for domain {domain}: {entry['failures']} consecutive failures "
+            f"(last: {entry.get('reason')}); next attempt after "
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(retry_at))}"
+        )
+        print(f"[CIRCUIT OPEN] {message}")
+        _PREFLIGHT[domain] = (False, message, 'skipped')
+        return False
+
+    target = admin_target(args)
+    if target is None:
+        _PREFLIGHT[domain] = (True, None, None)
+        return True
+
+    with profile_stage('preflight'):
+        result = probe_endpoints([target])[0]
+    if result.ok:
+        _PREFLIGHT[domain] = (True, None, None)
+        return True
+
+    reason = f"admin server {target.host}:{target.port} unreachable: {result.error}"
+    breaker.record_failure(domain, reason)
+    message = f"Preflight failed for domain {domain}: {reason}"
+    print(f"[ERROR] {message}")
+    _PREFLIGHT[domain] = (False, message, 'error')
+    return False
+
+
+# Bumped when cached entries may differ from a fresh parse, so older caches are ignored.
+CONFIG_CACHE_VERSION = 2
+
+
+def _config_cache_file(cache_dir, config_path):
+    import hashlib
+
+    digest = hashlib.sha1(str(config_path).encode('utf-8')).hexdigest()
+    return Path(cache_dir) / f"{digest}.json"
+
+
+# Nagios plugin exit codes, and the precedence used to pick the overall status.
+SEVERITY_CODES = {'ok': 0, 'warning': 1, 'critical': 2, 'unknown': 3}
+SEVERITY_PRECEDENCE = ('ok', 'unknown', 'warning', 'critical')
+
+RULE_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+RULE_PATTERN = re.compile(r'^\s*([\w.*-]+)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$')
+
+# Payload section names accepted as aliases of the check that returns them.
+RULE_SECTION_ALIASES = {'clusters': 'cluster', 'jmsServers': 'jms', 'datasources': 'datasource'}
+
+Rule = namedtuple('Rule', ['name', 'severity', 'section', 'path', 'op', 'value', 'expr', 'message'])
+
+
+def _rule_literal(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '\'"':
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    if lowered in ('null', 'none'):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def compile_rules(config_rules):
+    """Compile ``rules`` from the config into :class:`Rule` tuples.
+
+    Each rule is ``{'name', 'expr', 'severity', 'message'}`` (or just an
+    expression string) where ``expr`` is ``<check>.<path> <op> <value>``.
+    A ``*`` path segment matches every key (or list entry) at that level, and
+    a segment that is not a key descends into nested collections until it
+    matches, so ``threads.stuckThreadCount`` covers every server's thread pool.
+    """
+
+    compiled = []
+    for index, entry in enumerate(config_rules or [], start=1):
+        if isinstance(entry, str):
+            entry = {'expr': entry}
+        if not isinstance(entry, dict) or not entry.get('expr'):
+            raise ValueError(f"Rule #{index} must be an expression or a mapping with 'expr'")
+        expr = str(entry['expr'])
+        match = RULE_PATTERN.match(expr)
+        if not match:
+            raise ValueError(f"Rule #{index} has an invalid expression: {expr!r}")
+        path, op, literal = match.groups()
+        severity = str(entry.get('severity', 'warning')).lower()
+        if severity not in SEVERITY_CODES or severity == 'ok':
+            raise ValueError(f"Rule #{index} has an invalid severity: {severity!r}")
+        segments = path.split('.')
+        section = RULE_SECTION_ALIASES.get(segments[0], segments[0])
+        compiled.append(Rule(
+            name=str(entry.get('name') or expr),
+            severity=severity,
+            section=section,
+            path=tuple(segments[1:]),
+            op=RULE_OPERATORS[op],
+            value=_rule_literal(literal),
+            expr=expr,
+            message=entry.get('message'),
+        ))
+    return compiled
+
+
+def _rule_children(value):
+    """``(name, child)`` pairs of a collection; list entries without a name are named by index."""
+
+    for index, (key, child) in enumerate(iter_named_items(value)):
+        yield str(index if key is None else key), child
+
+
+def _collect_rule_values(value, path, prefix, out):
+    """Append ``(entity path, leaf value)`` pairs reached by ``path`` to ``out``."""
+
+    if not path:
+        out.append((prefix, value))
+        return
+    if not isinstance(value, (dict, list)):
+        return
+    segment = path[0]
+    if segment == '*':
+        rest = path[1:]
+        for key, child in _rule_children(value):
+            _collect_rule_values(child, rest, prefix + (key,), out)
+    elif isinstance(value, dict) and segment in value:
+        _collect_rule_values(value[segment], path[1:], prefix + (segment,), out)
+    else:
+        for key, child in _rule_children(value):
+            if isinstance(child, (dict, list)):
+                _collect_rule_values(child, path, prefix + (key,), out)
+
+
+def _rule_matches(rule, actual):
+    if actual is None or isinstance(actual, (dict, list)):
+        return False
+    expected = rule.value
+    if isinstance(expected, float) and not isinstance(actual, bool):
+        try:
+            actual = float(actual)
+        except (TypeError, ValueError):
+            return False
+    elif isinstance(expected, str):
+        actual = str(actual)
+    try:
+        return rule.op(actual, expected)
+    except TypeError:
+        return False
+
+
+def evaluate_rules(rules, results):
+    """Evaluate compiled rules over the structured check results in one pass.
+
+    Returns ``(findings, evaluated)``; a rule whose check produced no data
+    yields an ``unknown`` finding.
+    """
+
+    findings = []
+    evaluated = 0
+    for rule in rules:
+        data = results.get(rule.section)
+        if data is None:
+            findings.append({
+                'rule': rule.name,
+                'severity': 'unknown',
+                'entity': rule.section,
+                'value': None,
+                'expr': rule.expr,
+                'message': f"no data from the '{rule.section}' check",
+            })
+            continue
+        values = []
+        _collect_rule_values(data, rule.path, (rule.section,), values)
+        evaluated += len(values)
+        for entity, actual in values:
+            if _rule_matches(rule, actual):
+                findings.append({
+                    'rule': rule.name,
+                    'severity': rule.severity,
+                    'entity': '.'.join(entity),
+                    'value': actual,
+                    'expr': rule.expr,
+                    'message': rule.message,
+                })
+    return findings, evaluated
+
+
+def overall_severity(findings):
+    worst = 'ok'
+    for finding in findings:
+        if SEVERITY_PRECEDENCE.index(finding['severity']) > SEVERITY_PRECEDENCE.index(worst):
+            worst = finding['severity']
+    return worst
+
+
+def report_findings(rules, findings, evaluated):
+    """Print rule findings and return the Nagios exit code for the run."""
+
+    print("\n--- FINDINGS ---")
+    for finding in findings:
+        detail = finding['message'] or f"rule: {finding['expr']}"
+        if finding['value'] is None:
+            print(f"[{finding['severity'].upper()}] {finding['rule']}: {detail}")
+        else:
+            print(
+                f"[{finding['severity'].upper()}] {finding['rule']}: "
+                f"{finding['entity']} = {finding['value']} ({detail})"
+            )
+    worst = overall_severity(findings)
+    counts = ', '.join(
+        f"{sum(1 for finding in findings if finding['severity'] == level)} {level}"
+        for level in ('critical', 'warning', 'unknown')
+    )
+    print(f"Status: {worst.upper()} ({counts}; {len(rules)} rules over {evaluated} values)")
+    return SEVERITY_CODES[worst]
+
+
+def check_status(check, result):
+    """``{'status', 'message'}`` of a finished check: ok, or why it has no data.
+
+    WLST checks report ``timeout``, ``error``, ``skipped`` (open circuit) or
+    ``unavailable`` (no WLST configured); other checks without data are
+    ``unavailable``.
+    """
+
+    if result is not None:
+        return {'status': 'ok', 'message': None}
+    status, message = _WLST_FAILURES.get(check, ('unavailable', 'check produced no data'))
+    return {'status': status, 'message': message}
+
+
+def json_report(checks, results, statuses, findings, rules):
+    """Machine-readable form of a run for ``--json``.
+
+    ``results`` holds every requested check; a check without data is None,
+    and ``checks`` gives each one's status (``ok``, ``timeout``, ``error``,
+    ``skipped`` or ``unavailable``) with the reason. ``status`` is the worst
+    finding's severity, or None without rules.
+    """
+
+    report = dict.fromkeys(checks)
+    report.update(results)
+    return {
+        'generatedAt': time.time(),
+        'status': overall_severity(findings) if rules else None,
+        'rules': len(rules or ()),
+        'checks': {check: statuses.get(check) for check in checks},
+        'results': report,
+        'skipped': [check for check in checks if check not in results],
+        'findings': findings,
+    }
+
+
+TREND_SAMPLES = 10
+# Series not reported for this long (e.g. a removed server or destination) are dropped.
+TREND_RETENTION = 7 * 24 * 3600
+
+
+def trend_observations(results):
+    """Yield ``(series, value)`` for every metric tracked between runs.
+
+    ``series`` is a tuple such as ``('jms', jms_name, destination, metric)``;
+    entity names are kept whole, so they may contain any character.
+    """
+
+    for name, server in iter_named_items(results.get('managed_servers')):
+        if name is not None and isinstance(server, dict) and server.get('heapCurrent') is not None:
+            yield ('managed_servers', str(name), 'heapCurrent'), server['heapCurrent']
+    for jms_name, jms in iter_named_items(results.get('jms')):
+        if jms_name is None or not isinstance(jms, dict):
+            continue
+        for dest_name, destination in iter_named_items(jms.get('destinations')):
+            if dest_name is None or not isinstance(destination, dict):
+                continue
+            if destination.get('messagesCurrentCount') is not None:
+                yield ('jms', str(jms_name), str(dest_name), 'messagesCurrentCount'), destination['messagesCurrentCount']
+    for name, pool in iter_named_items(results.get('threads'), default_key='server'):
+        if name is None or not isinstance(pool, dict):
+            continue
+        for metric in ('throughput', 'pendingUserRequestCount'):
+            if pool.get(metric) is not None:
+                yield ('threads', str(name), metric), pool[metric]
+
+
+def _trend_series(key):
+    """Series tuple stored under the history file key ``key`` (a JSON list), or None."""
+
+    try:
+        series = json.loads(key)
+    except ValueError:
+        return None
+    if not isinstance(series, list) or len(series) < 3 or not all(isinstance(part, str) for part in series):
+        return None
+    return tuple(series)
+
+
+def series_stats(points):
+    """Delta, rate, floor and least-squares slope of ``[[epoch, value], ...]``.
+
+    A single pass over running sums; rates and slopes are per minute.
+    """
+
+    first_time = points[0][0]
+    count = sum_t = sum_v = sum_tt = sum_tv = 0.0
+    floor = None
+    for timestamp, value in points:
+        offset = (timestamp - first_time) / 60.0
+        count += 1
+        sum_t += offset
+        sum_v += value
+        sum_tt += offset * offset
+        sum_tv += offset * value
+        if floor is None or value < floor:
+            floor = value
+
+    (previous_time, previous), (latest_time, latest) = points[-2], points[-1]
+    minutes = (latest_time - previous_time) / 60.0
+    denominator = count * sum_tt - sum_t * sum_t
+    slope = (count * sum_tv - sum_t * sum_v) / denominator if denominator else 0.0
+    intercept = (sum_v - slope * sum_t) / count
+    return {
+        'samples': int(count),
+        'latest': latest,
+        'delta': latest - previous,
+        'ratePerMin': (latest - previous) / minutes if minutes > 0 else None,
+        'floor': floor,
+        'slopePerMin': slope,
+        'fitted': intercept + slope * (latest_time - first_time) / 60.0,
+    }
+
+
+def minutes_until(stats, limit):
+    """Forecast minutes until the fitted trend reaches ``limit`` (None if never)."""
+
+    if limit is None or stats['slopePerMin'] <= 0:
+        return None
+    return max((limit - stats['fitted']) / stats['slopePerMin'], 0.0)
+
+
+def analyze_trends(args, results, now=None):
+    """Append this run's metrics to the history and compute rates and forecasts.
+
+    Series missing from this run keep their samples; only series with no
+    sample for ``TREND_RETENTION`` seconds are removed from the history.
+    Returns a nested ``{check: {entity: {...}}}`` mapping that is also exposed
+    to threshold rules as the ``trends`` section.
+    """
+
+    now = time.time() if now is None else now
+    path = domain_state_file(args, 'trends')
+    try:
+        history = json.loads(path.read_text())
+    except (IOError, OSError, ValueError):
+        history = {}
+    if not isinstance(history, dict):
+        history = {}
+    # Keys are JSON-encoded series tuples; anything else is from an older format.
+    history = {key: points for key, points in history.items() if _trend_series(key)}
+
+    window = getattr(args, 'trend_samples', None) or TREND_SAMPLES
+    current = {}
+    for series, value in trend_observations(results):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        points = history.get(json.dumps(series)) or []
+        points.append([now, value])
+        del points[:-window]
+        current[series] = points
+    # Series this run did not report (no WLST data, skipped checks) are kept until they age out.
+    history.update((json.dumps(series), points) for series, points in current.items())
+    history = {
+        key: points for key, points in history.items()
+        if isinstance(points, list) and points and now - points[-1][0] <= TREND_RETENTION
+    }
+    try:
+        write_json_atomic(path, history)
+    except (IOError, OSError) as exc:
+        print(f"[WARN] Unable to persist trend samples to {path}: {exc}")
+
+    queue_limit = getattr(args, 'trend_queue_limit', None)
+    heap_max = {
+        str(name): server.get('heapMax') or None
+        for name, server in iter_named_items(results.get('managed_servers'))
+        if isinstance(server, dict)
+    }
+    trends = {}
+    for series, points in current.items():
+        if len(points) < 2:
+            continue
+        stats = series_stats(points)
+        section, metric = series[0], series[-1]
+        entity = trends.setdefault(section, {})
+        for name in series[1:-2]:
+            entity = entity.setdefault(name, {})
+        entry = entity.setdefault(series[-2], {})
+        if metric == 'heapCurrent':
+            entry.update({
+                'heapFloor': stats['floor'],
+                'heapSlopePerMin': stats['slopePerMin'],
+                'minutesToHeapMax': minutes_until(stats, heap_max.get(series[1])),
+                'samples': stats['samples'],
+            })
+        elif metric == 'messagesCurrentCount':
+            entry.update({
+                'pendingDelta': stats['delta'],
+                'growthPerMin': stats['ratePerMin'],
+                'minutesToLimit': minutes_until(stats, queue_limit),
+                'samples': stats['samples'],
+            })
+        elif metric == 'throughput':
+            entry['throughputDelta'] = stats['delta']
+        elif metric == 'pendingUserRequestCount':
+            entry['pendingGrowthPerMin'] = stats['ratePerMin']
+    return trends
+
+
+def print_trends(trends):
+    def eta(minutes, limit):
+        return '' if minutes is None else f" | {limit} in ~{minutes:.0f} min"
+
+    def rate(value):
+        return 'n/a' if value is None else f"{value:+.1f}/min"
+
+    print("\n--- TRENDS ---")
+    if not trends:
+        print("Not enough samples yet; trends need at least two runs")
+        return
+    for name, entry in sorted((trends.get('managed_servers') or {}).items()):
+        print(
+            f"Server {name}: heap floor {entry['heapFloor'] / 1024 / 1024:.1f}MB over {entry['samples']} samples"
+            f" | trend {entry['heapSlopePerMin'] / 1024 / 1024:+.1f}MB/min{eta(entry['minutesToHeapMax'], 'heapMax')}"
+        )
+    for jms_name, destinations in sorted((trends.get('jms') or {}).items()):
+        for dest_name, entry in sorted(destinations.items()):
+            print(
+                f"JMS {jms_name}/{dest_name}: pending {entry['pendingDelta']:+.0f} "
+                f"({rate(entry['growthPerMin'])}){eta(entry['minutesToLimit'], 'queue limit')}"
+            )
+    for name, entry in sorted((trends.get('threads') or {}).items()):
+        metrics = []
+        if 'throughputDelta' in entry:
+            metrics.append(f"throughput {entry['throughputDelta']:+.1f}")
+        if 'pendingGrowthPerMin' in entry:
+            metrics.append(f"pending requests {rate(entry['pendingGrowthPerMin'])}")
+        print(f"Thread pool {name}: {', '.join(metrics)}")
+
+
+def load_config(path, cache_dir=None):
+    """Load configuration from a JSON or YAML file.
+
+    With ``cache_dir``, parsed YAML is stored there as JSON keyed by the file's
+    resolved path, mtime and size, so later runs skip PyYAML entirely until
+    the file is edited.
+    """
     config_path = Path(path)
     if not config_path.exists():
         raise FileNotFoundError(f"Config file '{path}' not found")
 
-    text = config_path.read_text()
     suffix = config_path.suffix.lower()
-    if suffix in {'.yaml', '.yml'}:
+    is_yaml = suffix in {'.yaml', '.yml'}
+    cache_file = None
+    if is_yaml and cache_dir:
+        config_path = config_path.resolve()
+        stat = config_path.stat()
+        stamp = [CONFIG_CACHE_VERSION, str(config_path), stat.st_mtime_ns, stat.st_size]
+        cache_file = _config_cache_file(cache_dir, config_path)
+        try:
+            cached = json.loads(cache_file.read_text())
+        except (IOError, OSError, ValueError):
+            cached = None
+        if isinstance(cached, dict) and cached.get('stamp') == stamp:
+            return cached['data']
+
+    text = config_path.read_text()
+    if is_yaml:
         try:
             import yaml
         except ImportError as exc:  # pragma: no cover - optional dependency
@@ -357,9 +1945,29 @@ def load_config(path):
 
     if not isinstance(data, dict):
         raise ValueError("Configuration file must contain a JSON/YAML object")
+
+    if cache_file is not None and _survives_json(data):
+        try:
+            # The config may hold credentials, so the cached copy is private too.
+            write_json_atomic(cache_file, {'stamp': stamp, 'data': data}, mode=0o600)
+        except (IOError, OSError):
+            pass
     return data
 
 
+def _survives_json(data):
+    """True if ``data`` reads back from JSON unchanged.
+
+    YAML integer keys, tuples or dates would come back as strings or lists,
+    so such configs are not cached and every run sees what PyYAML returns.
+    """
+
+    try:
+        return json.loads(json.dumps(data)) == data
+    except (TypeError, ValueError):
+        return False
+
+
 def apply_config(args, config):
     """Merge configuration dictionary into argparse Namespace."""
 
@@ -385,12 +1993,60 @@ def apply_config(args, config):
     if 'password' in config and args.password is None:
         args.password = config['password']
     if 'ldap_host' in config and args.ldap_host is None:
-        args.ldap_host = config['ldap_host']
+        args.ldap_host = ensure_comma_separated(config['ldap_host'])
     if 'ldap_port' in config and (args.ldap_port == 389 or args.ldap_port is None):
         try:
             args.ldap_port = int(config['ldap_port'])
         except (TypeError, ValueError):
             raise ValueError("ldap_port must be an integer")
+    if 'probe_timeout' in config and args.probe_timeout is None:
+        try:
+            args.probe_timeout = float(config['probe_timeout'])
+        except (TypeError, ValueError):
+            raise ValueError("probe_timeout must be a number")
+    if 'probe_timeouts' in config:
+        if not isinstance(config['probe_timeouts'], dict):
+            raise ValueError("probe_timeouts must map endpoints, names or kinds to seconds")
+        args.probe_timeouts = config['probe_timeouts']
+    for key in ('check_timeout', 'run_timeout'):
+        if key in config and getattr(args, key) is None:
+            try:
+                setattr(args, key, float(config[key]))
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a number")
+    if 'trends' in config and not args.trends:
+        args.trends = bool(config['trends'])
+    for key in ('trend_samples', 'trend_queue_limit'):
+        if key in config and getattr(args, key) is None:
+            try:
+                setattr(args, key, int(config[key]))
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be an integer")
+    if 'datasource_exhaustion_percent' in config:
+        try:
+            args.datasource_exhaustion_percent = float(config['datasource_exhaustion_percent'])
+        except (TypeError, ValueError):
+            raise ValueError("datasource_exhaustion_percent must be a number")
+    if 'thread_dumps' in config and not args.thread_dumps:
+        args.thread_dumps = bool(config['thread_dumps'])
+    for key in THREAD_DUMP_ENV:
+        if key in config:
+            try:
+                setattr(args, key, int(config[key]))
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be an integer")
+    if 'rules' in config:
+        args.rules = compile_rules(config['rules'])
+    if 'mbean_stats' in config and not args.mbean_stats:
+        args.mbean_stats = bool(config['mbean_stats'])
+    if 'state_dir' in config and args.state_dir is None:
+        args.state_dir = config['state_dir']
+    for key in ('breaker_threshold', 'breaker_cooldown'):
+        if key in config and getattr(args, key) is None:
+            try:
+                setattr(args, key, int(config[key]))
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be an integer")
     if 'wlst_path' in config and getattr(args, 'wlst_path', None) is None:
         args.wlst_path = config['wlst_path']
     if 'wlst_exec' in config and args.wlst_exec is None and getattr(args, 'wlst_path', None) is None:
@@ -401,6 +2057,43 @@ def apply_config(args, config):
         args.wlst_sample_output = config['wlst_sample_output']
 
 
+def startup_profile(argv, top=15):
+    """Re-run the CLI under ``python -X importtime`` and summarise import cost.
+
+    The child's normal output is passed through; the import timings it writes
+    to stderr are aggregated into a table of the slowest top-level imports.
+    """
+
+    command = [sys.executable, '-X', 'importtime', str(Path(__file__).resolve())]
+    command.extend(arg for arg in argv if arg != '--startup-profile')
+
+    started = time.monotonic()
+    process = subprocess.Popen(command, stderr=subprocess.PIPE)
+    _, stderr_data = process.communicate()
+    wall = time.monotonic() - started
+
+    imports = []
+    for line in stderr_data.decode('utf-8', errors='replace').splitlines():
+        if not line.startswith('import time:'):
+            sys.stderr.write(line + '\n')
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(fields[0]), int(fields[1]), depth, name.strip()))
+
+    total_self = sum(item[0] for item in imports)
+    print("\n--- STARTUP PROFILE ---")
+    print(f"Wall time {wall:.3f}s | import time {total_self / 1000:.1f}ms across {len(imports)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    top_level = sorted((item for item in imports if item[2] == 0), key=lambda item: -item[1])
+    for self_us, cumulative_us, _, name in top_level[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    return process.returncode
+
+
 def main():
     parser = argparse.ArgumentParser(description='Oracle Fusion Middleware health check tool')
     parser.add_argument('--config', help='Path to JSON/YAML file containing parameters')
@@ -410,17 +2103,93 @@ def main():
     parser.add_argument('--admin-url', help='Admin server base URL (e.g. http://host:7001)')
     parser.add_argument('--username', help='Admin username for WLST checks')
     parser.add_argument('--password', help='Admin password for WLST checks')
-    parser.add_argument('--ldap-host', help='LDAP hostname to check')
+    parser.add_argument('--ldap-host', help='Comma separated LDAP hosts (host or host:port) to check')
     parser.add_argument('--ldap-port', type=int, default=389, help='LDAP port (default 389)')
+    parser.add_argument(
+        '--probe-timeout', type=float, help=f'TCP connect timeout for endpoint probes (default {PROBE_TIMEOUT:g}s)'
+    )
     parser.add_argument('--wlst-path', help='Path to wlst.sh (preferred)')
     parser.add_argument('--wlst-exec', help='Path to legacy WLST executable (deprecated)')
     parser.add_argument('--wlst-script', help='Path to the WLST script that emits JSON status')
     parser.add_argument('--wlst-sample-output', help='Path to a JSON file used to simulate WLST output')
+    parser.add_argument(
+        '--check-timeout',
+        type=float,
+        help=f'Seconds before a WLST check is killed (default {DEFAULT_CHECK_TIMEOUT})',
+    )
+    parser.add_argument(
+        '--run-timeout', type=float, help='Deadline in seconds for the whole run; remaining checks are skipped'
+    )
+    parser.add_argument(
+        '--state-dir', help=f'Directory for state kept between runs (default {DEFAULT_STATE_DIR})'
+    )
+    parser.add_argument(
+        '--breaker-threshold',
+        type=int,
+        help=f'Consecutive domain failures before WLST is skipped (default {BREAKER_THRESHOLD})',
+    )
+    parser.add_argument(
+        '--breaker-cooldown',
+        type=int,
+        help=f'Seconds an open domain circuit skips WLST before retrying (default {BREAKER_COOLDOWN})',
+    )
+    parser.add_argument(
+        '--profile', action='store_true', help='Print wall-clock and CPU time per stage and check'
+    )
+    parser.add_argument('--profile-json', help='Write the --profile timings as JSON to this file')
+    parser.add_argument('--profile-dump', help='Write cProfile statistics for the checks to this file')
+    parser.add_argument(
+        '--trends',
+        action='store_true',
+        help='Keep samples between runs and report rates, heap floors and forecasts',
+    )
+    parser.add_argument(
+        '--trend-samples', type=int, help=f'Samples kept per metric for trends (default {TREND_SAMPLES})'
+    )
+    parser.add_argument(
+        '--trend-queue-limit', type=int, help='JMS pending-message limit used for time-to-limit forecasts'
+    )
+    parser.add_argument(
+        '--thread-dumps',
+        action='store_true',
+        help='Capture thread dumps for servers with stuck or hogging threads (threads check)',
+    )
+    parser.add_argument(
+        '--mbean-stats',
+        action='store_true',
+        help='Report call counts and latency of every MBean getter used by the WLST collector',
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print results, findings and status as one JSON document; the text report goes to stderr',
+    )
+    parser.add_argument(
+        '--startup-profile',
+        action='store_true',
+        help='Run the requested checks under -X importtime and report import costs',
+    )
     args = parser.parse_args()
 
+    if args.startup_profile:
+        sys.exit(startup_profile(sys.argv[1:]))
+
+    stdout = sys.stdout
+    if args.json:
+        sys.stdout = sys.stderr
+
+    global _PROFILER
+    if args.profile or args.profile_json or args.profile_dump:
+        _PROFILER = StageProfiler()
+
+    # Baselines for the CPU and swap-rate checks so they never sleep for a sample window.
+    cpu_sampler()
+    swap_sampler()
+
     if args.config:
         try:
-            config = load_config(args.config)
+            with profile_stage('config'):
+                config = load_config(args.config, cache_dir=state_dir(args) / 'config-cache')
         except Exception as exc:
             print(f"[ERROR] {exc}")
             sys.exit(1)
@@ -442,10 +2211,11 @@ def main():
         'deployments': lambda: check_deployments(args),
         'composites': lambda: check_composites(args),
         'ldap': (
-            lambda: check_ldap(args.ldap_host, args.ldap_port)
+            lambda: check_ldap(args)
             if args.ldap_host
             else placeholder('LDAP')
         ),
+        'endpoints': lambda: check_endpoints(args),
     }
 
     if args.full:
@@ -456,9 +2226,74 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    args.deadline = time.monotonic() + args.run_timeout if args.run_timeout else None
+
+    profiler = None
+    if args.profile_dump:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    results = {}
+    statuses = {}
     for check in checks:
         print(f"\n--- {check.upper()} ---")
-        available[check]()
+        remaining = run_deadline_remaining(args)
+        if remaining is not None and remaining <= 0:
+            print(f"[TIMEOUT] Check skipped: run deadline of {args.run_timeout:g}s reached")
+            statuses[check] = {'status': 'skipped', 'message': f"run deadline of {args.run_timeout:g}s reached"}
+            continue
+        with profile_stage('check', check):
+            results[check] = available[check]()
+        statuses[check] = check_status(check, results[check])
+
+    if args.trends:
+        with profile_stage('trends'):
+            results['trends'] = analyze_trends(args, results)
+        print_trends(results['trends'])
+
+    exit_code = 0
+    findings = []
+    rules = getattr(args, 'rules', None)
+    if rules:
+        with profile_stage('rules'):
+            findings, evaluated = evaluate_rules(rules, results)
+            exit_code = report_findings(rules, findings, evaluated)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile_dump)
+
+    if args.mbean_stats:
+        print("\n--- MBEAN STATS ---")
+        if _MBEAN_STATS:
+            for line in mbean_stats_lines():
+                print(line)
+        else:
+            print("No MBean calls recorded (sample payloads make no remote calls)")
+
+    if _PROFILER is not None:
+        print("\n--- PROFILE ---")
+        for line in _PROFILER.summary_lines():
+            print(line)
+        if args.profile_dump:
+            print(f"cProfile statistics written to {args.profile_dump}")
+        if args.profile_json:
+            profile = _PROFILER.as_dict()
+            if _MBEAN_STATS:
+                profile['mbeanStats'] = [
+                    dict(stats, mbeanType=mbean_type, attribute=attribute)
+                    for (mbean_type, attribute), stats in _MBEAN_STATS.items()
+                ]
+            write_json_atomic(args.profile_json, profile)
+
+    if args.json:
+        document = json_report(checks, results, statuses, findings, rules)
+        stdout.write(json.dumps(document, default=str) + '\n')
+        stdout.flush()
+
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
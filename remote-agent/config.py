@@ -1,12 +1,11 @@
 from __future__ import annotations
 
+import copy
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 
 @dataclass
 class ServerConfig:
@@ -17,6 +16,33 @@ class ServerConfig:
     strict_host_key_checking: bool = True
 
 
+@dataclass
+class ConnectionPoolConfig:
+    enabled: bool = True
+    max_size: int = 8
+    idle_timeout_seconds: int = 300
+    health_check_seconds: int = 30
+    failure_backoff_seconds: int = 60
+    control_dir: str | None = None
+
+
+@dataclass
+class ResultCacheConfig:
+    enabled: bool = False
+    ttl_seconds: float = 10
+    max_entries: int = 256
+    max_bytes: int = 8 * 1024 * 1024
+
+
+@dataclass
+class HealthCheckConfig:
+    enabled: bool = False
+    command: str = "python3 middleware_healthcheck.py --full --json"
+    server: str | None = None
+    refresh_seconds: float = 300
+    timeout_seconds: int = 600
+
+
 @dataclass
 class RuntimeConfig:
     openai_api_key: str
@@ -25,6 +51,17 @@ class RuntimeConfig:
     timeout_seconds: int
     max_output_chars: int
     servers: dict[str, ServerConfig]
+    ssh_binary: str = "ssh"
+    fanout_concurrency: int = 8
+    max_output_bytes: int = 64 * 1024 * 1024
+    max_concurrency: int = 32
+    per_server_concurrency: int = 4
+    tool_concurrency: int = 4
+    history_token_budget: int = 24000
+    tool_excerpt_chars: int = 800
+    connection_pool: ConnectionPoolConfig = field(default_factory=ConnectionPoolConfig)
+    result_cache: ResultCacheConfig = field(default_factory=ResultCacheConfig)
+    healthcheck: HealthCheckConfig = field(default_factory=HealthCheckConfig)
 
 
 def _expand_env(value: Any) -> Any:
@@ -37,8 +74,31 @@ def _expand_env(value: Any) -> Any:
     return value
 
 
+# Resolved path -> ((mtime_ns, size), validated config).
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], RuntimeConfig]] = {}
+
+
 def load_config(path: str | os.PathLike[str]) -> RuntimeConfig:
-    cfg_path = Path(path)
+    """Load and validate a config file, reusing the parsed result until it changes.
+
+    Callers get their own copy, so edits such as the Streamlit sidebar overrides
+    never leak into the cache.
+    """
+    cfg_path = Path(path).resolve()
+    stat = cfg_path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(str(cfg_path))
+    if cached and cached[0] == stamp:
+        return copy.deepcopy(cached[1])
+
+    runtime = _parse_config(cfg_path)
+    _CONFIG_CACHE[str(cfg_path)] = (stamp, runtime)
+    return copy.deepcopy(runtime)
+
+
+def _parse_config(cfg_path: Path) -> RuntimeConfig:
+    import yaml  # deferred: only needed when a config file is actually parsed
+
     raw = yaml.safe_load(cfg_path.read_text())
     raw = _expand_env(raw)
 
@@ -56,6 +116,35 @@ def load_config(path: str | os.PathLike[str]) -> RuntimeConfig:
             strict_host_key_checking=bool(server.get("strict_host_key_checking", True)),
         )
 
+    pool_cfg = exec_cfg.get("connection_pool") or {}
+    connection_pool = ConnectionPoolConfig(
+        enabled=bool(pool_cfg.get("enabled", True)),
+        max_size=int(pool_cfg.get("max_size", 8)),
+        idle_timeout_seconds=int(pool_cfg.get("idle_timeout_seconds", 300)),
+        health_check_seconds=int(pool_cfg.get("health_check_seconds", 30)),
+        failure_backoff_seconds=int(pool_cfg.get("failure_backoff_seconds", 60)),
+        control_dir=pool_cfg.get("control_dir"),
+    )
+
+    cache_cfg = exec_cfg.get("result_cache") or {}
+    result_cache = ResultCacheConfig(
+        enabled=bool(cache_cfg.get("enabled", False)),
+        ttl_seconds=float(cache_cfg.get("ttl_seconds", 10)),
+        max_entries=int(cache_cfg.get("max_entries", 256)),
+        max_bytes=int(cache_cfg.get("max_bytes", 8 * 1024 * 1024)),
+    )
+
+    health_cfg = raw.get("healthcheck") or {}
+    healthcheck = HealthCheckConfig(
+        enabled=bool(health_cfg.get("enabled", False)),
+        command=health_cfg.get("command", HealthCheckConfig.command),
+        server=health_cfg.get("server"),
+        refresh_seconds=float(health_cfg.get("refresh_seconds", 300)),
+        timeout_seconds=int(health_cfg.get("timeout_seconds", 600)),
+    )
+    if healthcheck.server is not None and healthcheck.server not in servers:
+        raise ValueError(f"healthcheck.server '{healthcheck.server}' is not a configured server.")
+
     api_key = openai_cfg.get("api_key") or os.getenv("OPENAI_API_KEY", "")
     if not api_key:
         raise ValueError("OpenAI API key missing. Set openai.api_key or OPENAI_API_KEY.")
@@ -70,4 +159,15 @@ def load_config(path: str | os.PathLike[str]) -> RuntimeConfig:
         timeout_seconds=int(exec_cfg.get("timeout_seconds", 120)),
         max_output_chars=int(exec_cfg.get("max_output_chars", 12000)),
         servers=servers,
+        ssh_binary=exec_cfg.get("ssh_binary", "ssh"),
+        fanout_concurrency=int(exec_cfg.get("fanout_concurrency", 8)),
+        max_output_bytes=int(exec_cfg.get("max_output_bytes", 64 * 1024 * 1024)),
+        max_concurrency=int(exec_cfg.get("max_concurrency", 32)),
+        per_server_concurrency=int(exec_cfg.get("per_server_concurrency", 4)),
+        tool_concurrency=int(agent_cfg.get("tool_concurrency", 4)),
+        history_token_budget=int(agent_cfg.get("history_token_budget", 24000)),
+        tool_excerpt_chars=int(agent_cfg.get("tool_excerpt_chars", 800)),
+        connection_pool=connection_pool,
+        result_cache=result_cache,
+        healthcheck=healthcheck,
     )
@@ -1,26 +1,84 @@
 from __future__ import annotations
 
 import argparse
-
-from fastmcp import FastMCP
+import json
+from typing import TYPE_CHECKING
 
 from config import load_config
-from remote_exec import RemoteExecutor
+from health_snapshot import HealthCheckName, HealthSnapshot
+from remote_exec import AsyncRemoteExecutor, build_executor
+from result_cache import ResultCache
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
 
 
 def build_mcp(config_path: str) -> FastMCP:
+    from fastmcp import FastMCP  # deferred so `--help` and config errors stay fast
+
     runtime = load_config(config_path)
-    executor = RemoteExecutor(
-        runtime.servers,
-        timeout_seconds=runtime.timeout_seconds,
-        max_output_chars=runtime.max_output_chars,
+    executor = build_executor(
+        runtime,
+        AsyncRemoteExecutor,
+        max_concurrency=runtime.max_concurrency,
+        per_server_concurrency=runtime.per_server_concurrency,
     )
 
+    cache = ResultCache.from_config(runtime.result_cache) if runtime.result_cache.enabled else None
+
     mcp = FastMCP("remote-ops-mcp")
 
     @mcp.tool(description="Run a shell script on one configured remote server over SSH")
-    def run_remote_script(server_name: str, script: str) -> dict:
-        return executor.run_remote_script(server_name=server_name, script=script)
+    async def run_remote_script(server_name: str, script: str) -> dict:
+        if cache is None:
+            return await executor.arun_remote_script(server_name=server_name, script=script)
+        cached = cache.get(server_name, script)
+        if cached is not None:
+            return cached
+        result = await executor.arun_remote_script(server_name=server_name, script=script)
+        return cache.put(server_name, script, result)
+
+    @mcp.tool(
+        description=(
+            "Run the same shell script on several configured servers in parallel. "
+            "`servers` takes names or glob patterns such as 'soa-*' or '*'; results are reported per server"
+        )
+    )
+    async def run_on_servers(servers: list[str], script: str, timeout_seconds: int | None = None) -> dict:
+        result = await executor.arun_on_servers(servers, script, timeout_seconds=timeout_seconds)
+        if cache is not None:
+            # The script may have changed what cached run_remote_script results show.
+            cache.record_run(list(result["results"]), script)
+        return result
+
+    if runtime.healthcheck.enabled:
+        snapshot = HealthSnapshot(runtime.healthcheck, executor)
+
+        @mcp.tool(
+            description=(
+                "Overall WebLogic/middleware health from the shared health-check snapshot: status, rule "
+                "findings and per-check counts, states and entities needing attention. Answers from memory; "
+                "set refresh=true only when the data must be current"
+            )
+        )
+        async def health_summary(refresh: bool = False) -> dict:
+            await snapshot.current(max_age=0 if refresh else None)
+            return snapshot.summary()
+
+        @mcp.tool(
+            description=(
+                "Structured results of one health check from the shared snapshot, optionally narrowed to one "
+                "entry (a server, data source, JMS server, ...), with the findings about it"
+            )
+        )
+        async def health_check(check: HealthCheckName, item: str | None = None, refresh: bool = False) -> dict:
+            await snapshot.current(max_age=0 if refresh else None)
+            return snapshot.check(check, item)
+
+        @mcp.resource("health://snapshot", mime_type="application/json")
+        async def health_snapshot() -> str:
+            await snapshot.current()
+            return json.dumps(snapshot.document(), default=str)
 
     @mcp.tool(description="List configured remote servers")
     def list_servers() -> dict:
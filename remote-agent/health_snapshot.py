@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import time
+from collections import Counter
+from typing import Any, Literal
+
+from config import HealthCheckConfig
+from remote_exec import AsyncRemoteExecutor, _kill
+
+HealthCheckName = Literal[
+    "cpu",
+    "memory",
+    "servers",
+    "managed_servers",
+    "cluster",
+    "jms",
+    "threads",
+    "datasource",
+    "deployments",
+    "composites",
+    "ldap",
+    "endpoints",
+    "trends",
+]
+
+# Checks whose results are host metrics rather than a collection of named entities.
+METRIC_CHECKS = ("cpu", "memory")
+HEALTHY_STATES = {"RUNNING", "ACTIVE", "OK", "HEALTH_OK"}
+MAX_SUMMARY_FINDINGS = 20
+
+
+def decode_report(output: str) -> dict:
+    """Return the ``--json`` document: the last JSON line, after any login-shell noise."""
+    for line in reversed(output.splitlines()):
+        if line.strip().startswith("{"):
+            return json.loads(line)
+    raise ValueError("no JSON document in the output")
+
+
+def needs_attention(entity: Any) -> bool:
+    """True for an entity that is down, unhealthy, unreachable or close to exhaustion."""
+    if not isinstance(entity, dict):
+        return False
+    state = entity.get("state") or entity.get("status")
+    if isinstance(state, str) and state.upper() not in HEALTHY_STATES:
+        return True
+    health = entity.get("health")
+    if isinstance(health, str) and health.upper() not in HEALTHY_STATES:
+        return True
+    if entity.get("running") is False or entity.get("reachable") is False or entity.get("nearExhaustion"):
+        return True
+    if entity.get("stuckThreadCount"):
+        return True
+    members = entity.get("servers")
+    return isinstance(members, dict) and any(needs_attention(member) for member in members.values())
+
+
+def summarize_check(check: str, section: Any) -> Any:
+    """Compact view of one check: metrics rounded, or entity count, states and problem entities."""
+    if section is None:
+        return None
+    if check in METRIC_CHECKS:
+        return {key: round(value, 1) for key, value in section.items() if isinstance(value, (int, float))}
+    if check == "trends" or not isinstance(section, dict):
+        return {"available": True}
+    if check == "endpoints":
+        section = {f"{kind}/{name}": probe for kind, probes in section.items() for name, probe in probes.items()}
+    states = Counter(
+        entity.get("state") or entity.get("status")
+        for entity in section.values()
+        if isinstance(entity, dict) and (entity.get("state") or entity.get("status"))
+    )
+    summary: dict[str, Any] = {"count": len(section)}
+    if states:
+        summary["states"] = dict(states)
+    summary["attention"] = [name for name, entity in section.items() if needs_attention(entity)]
+    return summary
+
+
+class HealthSnapshot:
+    """Latest ``middleware_healthcheck.py --json`` run, shared by every MCP client.
+
+    The health check runs over SSH on ``cfg.server`` (or locally when unset)
+    at most once at a time: callers that arrive during a refresh wait for it
+    instead of starting their own. A background task refreshes the snapshot
+    every ``refresh_seconds``, so most queries are answered from memory
+    without any WLST or SSH work. A failed refresh keeps the previous
+    snapshot and reports the error alongside it.
+    """
+
+    def __init__(self, cfg: HealthCheckConfig, executor: AsyncRemoteExecutor) -> None:
+        self.cfg = cfg
+        self.executor = executor
+        self.report: dict | None = None
+        self.error: str | None = None
+        self.refreshed_at: float | None = None
+        self.attempted_at: float | None = None
+        self.duration: float | None = None
+        self.refreshes = 0
+        self._inflight: asyncio.Future | None = None
+        self._loop_task: asyncio.Task | None = None
+
+    def age(self) -> float | None:
+        return None if self.refreshed_at is None else time.monotonic() - self.refreshed_at
+
+    @property
+    def refreshing(self) -> bool:
+        return self._inflight is not None and not self._inflight.done()
+
+    def start(self) -> None:
+        """Start the background refresh loop; needs a running event loop."""
+        if self._loop_task is None:
+            self._loop_task = asyncio.get_running_loop().create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            # Wait out the rest of the interval when a caller refreshed in the meantime.
+            since = time.monotonic() - self.attempted_at if self.attempted_at is not None else None
+            if since is not None and since < self.cfg.refresh_seconds:
+                await asyncio.sleep(self.cfg.refresh_seconds - since)
+                continue
+            await self.refresh()
+
+    async def refresh(self) -> None:
+        if not self.refreshing:
+            self._inflight = asyncio.ensure_future(self._refresh())
+        # A caller that gives up must not cancel the refresh the others wait for.
+        await asyncio.shield(self._inflight)
+
+    async def current(self, max_age: float | None = None) -> HealthSnapshot:
+        """Return self, refreshing first if nothing was collected yet or it is older than ``max_age``."""
+        self.start()
+        age = self.age()
+        if self.attempted_at is None or (max_age is not None and (age is None or age > max_age)):
+            await self.refresh()
+        return self
+
+    async def _refresh(self) -> None:
+        started = time.monotonic()
+        try:
+            output, error = await self._run()
+        except OSError as exc:
+            output, error = "", f"Unable to run the health check: {exc}"
+        if error is None:
+            try:
+                report = decode_report(output)
+            except ValueError as exc:
+                error = f"Health check did not print a --json report: {exc}"
+        self.attempted_at = time.monotonic()
+        self.duration = self.attempted_at - started
+        self.error = error
+        if error is None:
+            self.report = report
+            self.refreshed_at = self.attempted_at
+            self.refreshes += 1
+
+    async def _run(self) -> tuple[str, str | None]:
+        """Run the health check command; returns its stdout and an error, if any."""
+        if self.cfg.server:
+            stdout: list[str] = []
+
+            def collect(stream: str, text: str) -> None:
+                if stream == "stdout":
+                    stdout.append(text)
+
+            result = await self.executor.arun_remote_script(
+                self.cfg.server,
+                self.cfg.command,
+                timeout_seconds=self.cfg.timeout_seconds,
+                on_output=collect,
+            )
+            error = result.get("error")
+            if not error and result.get("returncode") not in (0, 1, 2, 3):  # Nagios statuses
+                error = f"Health check exited with {result.get('returncode')}: {result.get('stderr', '')[-500:]}"
+            return "".join(stdout), error
+
+        proc = await asyncio.create_subprocess_shell(
+            self.cfg.command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        try:
+            stdout_bytes, stderr_bytes = await asyncio.wait_for(proc.communicate(), self.cfg.timeout_seconds)
+        except asyncio.TimeoutError:
+            return "", f"Timed out after {self.cfg.timeout_seconds} seconds"
+        finally:
+            if proc.returncode is None:
+                _kill(proc)
+                await asyncio.shield(proc.wait())
+        error = None
+        if proc.returncode not in (0, 1, 2, 3):
+            stderr = stderr_bytes.decode("utf-8", errors="replace")
+            error = f"Health check exited with {proc.returncode}: {stderr[-500:]}"
+        return stdout_bytes.decode("utf-8", errors="replace"), error
+
+    def _header(self) -> dict:
+        report = self.report or {}
+        age = self.age()
+        return {
+            "ok": self.report is not None,
+            "generatedAt": report.get("generatedAt"),
+            "ageSeconds": None if age is None else round(age, 1),
+            "refreshing": self.refreshing,
+            "error": self.error,
+            "status": report.get("status"),
+        }
+
+    def summary(self) -> dict:
+        """Overall status, findings and a compact view of every check (or why it has no data)."""
+        summary = self._header()
+        if self.report is None:
+            return summary
+        findings = self.report.get("findings") or []
+        summary["findings"] = [
+            {key: finding.get(key) for key in ("severity", "rule", "entity", "value")}
+            for finding in findings[:MAX_SUMMARY_FINDINGS]
+        ]
+        if len(findings) > MAX_SUMMARY_FINDINGS:
+            summary["moreFindings"] = len(findings) - MAX_SUMMARY_FINDINGS
+        statuses = self.report.get("checks") or {}
+        summary["checks"] = {}
+        for check, section in (self.report.get("results") or {}).items():
+            view = summarize_check(check, section)
+            status = statuses.get(check) or {}
+            if status.get("status") not in (None, "ok"):
+                # Say why there is no data: timed out, failed, skipped or not configured.
+                view = {"status": status["status"], "message": status.get("message")}
+            summary["checks"][check] = view
+        summary["skipped"] = self.report.get("skipped") or []
+        return summary
+
+    def check(self, check: str, item: str | None = None) -> dict:
+        """Full results of one check (or one of its entities) with the findings about it."""
+        result = self._header()
+        if self.report is None:
+            return result
+        results = self.report.get("results") or {}
+        result["check"] = check
+        if check not in results:
+            result["ok"] = False
+            result["error"] = f"Check '{check}' is not part of the snapshot. Available: {', '.join(results)}"
+            return result
+        data = results[check]
+        if item is not None:
+            if not isinstance(data, dict) or item not in data:
+                result["ok"] = False
+                names = ", ".join(data) if isinstance(data, dict) else ""
+                result["error"] = f"Unknown {check} entry '{item}'. Available: {names}"
+                return result
+            data = data[item]
+        prefix = check if item is None else f"{check}.{item}"
+        result["checkStatus"] = (self.report.get("checks") or {}).get(check)
+        result["data"] = data
+        result["findings"] = [
+            finding
+            for finding in self.report.get("findings") or []
+            if finding.get("entity") == prefix or str(finding.get("entity", "")).startswith(prefix + ".")
+        ]
+        return result
+
+    def document(self) -> dict:
+        """The whole snapshot, for the MCP resource."""
+        document = self._header()
+        if self.report is not None:
+            document.update(self.report)
+        document["refreshes"] = self.refreshes
+        document["lastDurationSeconds"] = None if self.duration is None else round(self.duration, 2)
+        return document
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count (about four characters per token) of a message or string."""
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return len(text) // 4 + 1
+
+
+def excerpt(text: str, limit: int) -> str:
+    """Head and tail of ``text`` within ``limit`` characters."""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}\n... [{len(text) - 2 * half} chars omitted] ...\n{text[-half:]}"
+
+
+@dataclass
+class OutputStore:
+    """Full tool outputs that were compacted out of the history, by reference."""
+
+    outputs: dict[str, str] = field(default_factory=dict)
+
+    def put(self, content: str) -> str:
+        ref = hashlib.sha256(content.encode()).hexdigest()[:12]
+        self.outputs[ref] = content
+        return ref
+
+    def get(self, ref: str) -> dict:
+        if ref not in self.outputs:
+            return {"ok": False, "error": f"Unknown output reference '{ref}'"}
+        return {"ok": True, "ref": ref, "output": json.loads(self.outputs[ref])}
+
+
+@dataclass
+class HistoryStats:
+    compacted: int = 0
+    tokens_saved: int = 0
+    last_tokens: int = 0
+
+
+def _summarize_run(result: dict, excerpt_chars: int) -> dict:
+    summary = {key: result[key] for key in ("ok", "returncode", "error", "truncated") if key in result}
+    for stream in ("stdout", "stderr"):
+        if excerpt_chars and result.get(stream):
+            summary[stream] = excerpt(result[stream], excerpt_chars)
+    return summary
+
+
+def summarize_tool_result(result: Any, ref: str, excerpt_chars: int) -> dict:
+    """Compact form of a tool result: status fields plus head/tail excerpts of the output."""
+    summary: dict[str, Any] = {"compacted": True, "ref": ref}
+    if not isinstance(result, dict):
+        summary["excerpt"] = excerpt(json.dumps(result), excerpt_chars)
+    elif "results" in result:  # run_on_servers
+        per_host = excerpt_chars and max(80, excerpt_chars // max(1, len(result["results"])))
+        summary["summary"] = result.get("summary")
+        summary["unmatched"] = result.get("unmatched")
+        summary["results"] = {name: _summarize_run(host, per_host) for name, host in result["results"].items()}
+    else:
+        summary.update(_summarize_run(result, excerpt_chars))
+    return summary
+
+
+def _has_excerpts(summary: dict) -> bool:
+    hosts = summary.get("results") or {}
+    return any(key in summary for key in ("stdout", "stderr", "excerpt")) or any(
+        "stdout" in host or "stderr" in host for host in hosts.values()
+    )
+
+
+class HistoryManager:
+    """Keep the chat history within a token budget.
+
+    When the history exceeds ``budget_tokens``, tool results older than the
+    latest user message are replaced, oldest first, by a summary with
+    head/tail excerpts. The full output moves to the :class:`OutputStore`,
+    where the model can fetch it again through the ``get_tool_output`` tool.
+    User and assistant messages are never changed.
+    """
+
+    def __init__(self, budget_tokens: int, excerpt_chars: int, store: OutputStore, stats: HistoryStats) -> None:
+        self.budget_tokens = budget_tokens
+        self.excerpt_chars = excerpt_chars
+        self.store = store
+        self.stats = stats
+
+    def compact(self, messages: list[dict]) -> list[dict]:
+        sizes = [estimate_tokens(message) for message in messages]
+        total = sum(sizes)
+        if total > self.budget_tokens:
+            last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=len(messages))
+            messages = list(messages)
+            # First replace outputs with excerpts; if that is not enough, drop the excerpts too.
+            for excerpt_chars in (self.excerpt_chars, 0):
+                for index in range(last_user):
+                    if total <= self.budget_tokens:
+                        break
+                    message = messages[index]
+                    if message.get("role") != "tool":
+                        continue
+                    content = json.loads(message["content"])
+                    was_compacted = isinstance(content, dict) and content.get("compacted")
+                    if was_compacted:
+                        if excerpt_chars or not _has_excerpts(content):
+                            continue
+                        ref = content["ref"]
+                        content = json.loads(self.store.outputs[ref])
+                    else:
+                        ref = self.store.put(message["content"])
+                    compacted = dict(message, content=json.dumps(summarize_tool_result(content, ref, excerpt_chars)))
+                    saved = sizes[index] - estimate_tokens(compacted)
+                    if saved <= 0:
+                        continue
+                    if not was_compacted:
+                        self.stats.compacted += 1
+                    messages[index] = compacted
+                    sizes[index] -= saved
+                    total -= saved
+                    self.stats.tokens_saved += saved
+        self.stats.last_tokens = total
+        return messages
@@ -1,60 +1,692 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
+import fnmatch
+import getpass
+import hashlib
+import os
 import shlex
+import signal
+import stat
 import subprocess
-from dataclasses import asdict
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import IO, Callable
 
-from config import ServerConfig
+from config import ConnectionPoolConfig, RuntimeConfig, ServerConfig
+
+
+def ssh_base_command(server: ServerConfig, ssh_binary: str = "ssh") -> list[str]:
+    """Return the ``ssh`` argv up to (not including) the target for ``server``."""
+    cmd = [ssh_binary, "-p", str(server.port)]
+    if server.key_path:
+        cmd.extend(["-i", server.key_path])
+    if not server.strict_host_key_checking:
+        cmd.extend(["-o", "StrictHostKeyChecking=no", "-o", "UserKnownHostsFile=/dev/null"])
+    return cmd
+
+
+def default_control_dir() -> str:
+    # Unix socket paths are limited to ~104 bytes, so keep the directory short.
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "remote-ops-ssh")
+    return os.path.join(tempfile.gettempdir(), f"remote-ops-ssh-{getpass.getuser()}")
+
+
+def private_dir_error(path: str) -> str | None:
+    """Create ``path`` if needed; return why it cannot safely hold control sockets, or None.
+
+    Anyone who can place a socket in the directory can have commands routed
+    through their own master, so it must be a real directory (not a symlink)
+    owned by this user and closed to everyone else.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+    except OSError as exc:
+        return f"cannot create {path}: {exc}"
+    if not stat.S_ISDIR(info.st_mode):
+        return f"{path} is not a directory"
+    if info.st_uid != os.getuid():
+        return f"{path} is owned by another user"
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        return f"{path} has mode {stat.S_IMODE(info.st_mode):o}, expected 700"
+    return None
+
+
+@dataclass
+class _Connection:
+    control_path: str
+    last_used: float
+    last_checked: float
+
+
+class SSHConnectionPool:
+    """Multiplexed SSH connections (OpenSSH ControlMaster sockets), one per server.
+
+    Each server gets a background master connection; commands then run as
+    sessions over its control socket and skip the TCP, key-exchange and
+    authentication round trips. Masters are health-checked with ``ssh -O check``
+    before reuse, closed after ``idle_timeout`` seconds without use (ssh's own
+    ``ControlPersist`` enforces the same limit if this process goes away), and
+    the least recently used master is closed when ``max_size`` is reached.
+    Every ``ssh_options`` that returns options must be paired with a
+    ``release`` once the command ends; a master with commands still running
+    is never closed, so the pool can briefly exceed ``max_size``.
+
+    Sockets are named after the server identity inside a private per-user
+    directory (``$XDG_RUNTIME_DIR/remote-ops-ssh`` when set), so executors
+    created later (or in another process) adopt running masters. If that
+    directory is not a 0700 directory owned by this user, pooling is disabled.
+    When a master cannot be opened, the server is connected to directly
+    without another attempt for ``failure_backoff`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 8,
+        idle_timeout: float = 300,
+        health_check_interval: float = 30,
+        control_dir: str | None = None,
+        ssh_binary: str = "ssh",
+        connect_timeout: float = 15,
+        failure_backoff: float = 60,
+    ) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.ssh_binary = ssh_binary
+        self.connect_timeout = connect_timeout
+        self.failure_backoff = failure_backoff
+        self.control_dir = control_dir or default_control_dir()
+        # Set when the control directory is unsafe; every command then connects directly.
+        self.disabled = private_dir_error(self.control_dir)
+        if self.disabled:
+            warnings.warn(f"SSH connection reuse disabled: {self.disabled}", RuntimeWarning, stacklevel=2)
+        self._connections: dict[str, _Connection] = {}
+        self._lock = threading.Lock()
+        self._server_locks: dict[str, threading.Lock] = {}
+        self._failures: dict[str, float] = {}
+        # Commands currently running over each master, by key.
+        self._in_use: dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, cfg: ConnectionPoolConfig, ssh_binary: str = "ssh") -> SSHConnectionPool:
+        return cls(
+            max_size=cfg.max_size,
+            idle_timeout=cfg.idle_timeout_seconds,
+            health_check_interval=cfg.health_check_seconds,
+            control_dir=cfg.control_dir,
+            ssh_binary=ssh_binary,
+            failure_backoff=cfg.failure_backoff_seconds,
+        )
+
+    def _key(self, server: ServerConfig) -> str:
+        identity = f"{server.user}@{server.host}:{server.port}:{server.key_path or ''}"
+        return hashlib.sha1(identity.encode()).hexdigest()[:16]
+
+    def _control(self, server: ServerConfig, path: str, operation: str) -> bool:
+        """Run ``ssh -O <operation>`` against the master behind ``path``."""
+        cmd = ssh_base_command(server, self.ssh_binary)
+        cmd.extend(["-o", f"ControlPath={path}", "-O", operation, f"{server.user}@{server.host}"])
+        try:
+            proc = subprocess.run(cmd, capture_output=True, timeout=self.connect_timeout, check=False)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return proc.returncode == 0
+
+    def _start_master(self, server: ServerConfig, path: str) -> bool:
+        cmd = ssh_base_command(server, self.ssh_binary)
+        cmd.extend(
+            [
+                "-o", "ControlMaster=yes",
+                "-o", f"ControlPath={path}",
+                "-o", f"ControlPersist={int(self.idle_timeout)}",
+                "-o", f"ConnectTimeout={int(self.connect_timeout)}",
+                "-N", "-f",
+                f"{server.user}@{server.host}",
+            ]
+        )
+        # The backgrounded master keeps its stdio open; pipes would make run() wait for it.
+        try:
+            proc = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.connect_timeout + 5,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return proc.returncode == 0
+
+    def _evict_idle(self, now: float) -> list[tuple[str, _Connection]]:
+        """Pop idle connections, then the least recently used ones beyond ``max_size - 1``.
+
+        Masters with commands running are skipped: closing one would kill them.
+        """
+        idle = [(key, conn) for key, conn in self._connections.items() if not self._in_use.get(key)]
+        evicted = [(key, conn) for key, conn in idle if now - conn.last_used > self.idle_timeout]
+        for key, _ in evicted:
+            del self._connections[key]
+        by_age = sorted((item for item in idle if item[0] in self._connections), key=lambda item: item[1].last_used)
+        while by_age and len(self._connections) >= self.max_size:
+            key, conn = by_age.pop(0)
+            del self._connections[key]
+            evicted.append((key, conn))
+        return evicted
+
+    def ssh_options(self, server: ServerConfig) -> list[str]:
+        """Return ``ssh`` options that route a command through a healthy master.
+
+        Returns an empty list when no master could be established; the caller
+        then connects directly, exactly as without a pool. Otherwise the master
+        counts as in use until the caller calls ``release(server)``.
+        """
+        if self.disabled:
+            return []
+        key = self._key(server)
+        now = time.monotonic()
+        with self._lock:
+            failed_at = self._failures.get(key)
+            if failed_at is not None and now - failed_at < self.failure_backoff:
+                return []
+            conn = self._connections.get(key)
+            stale = [] if conn else self._evict_idle(now)
+            server_lock = self._server_locks.setdefault(key, threading.Lock())
+        for _, old in stale:
+            self._close_path(old.control_path)
+
+        with server_lock:
+            with self._lock:
+                # Another caller may have failed to open the master while this one waited.
+                failed_at = self._failures.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < self.failure_backoff:
+                return []
+            path = os.path.join(self.control_dir, key)
+            if conn is None or now - conn.last_checked > self.health_check_interval:
+                healthy = os.path.exists(path) and self._control(server, path, "check")
+                if not healthy and not self._start_master(server, path):
+                    with self._lock:
+                        self._connections.pop(key, None)
+                        self._failures[key] = time.monotonic()
+                    return []
+                conn = _Connection(control_path=path, last_used=now, last_checked=now)
+            conn.last_used = now
+            with self._lock:
+                self._connections[key] = conn
+                self._failures.pop(key, None)
+                self._in_use[key] = self._in_use.get(key, 0) + 1
+        return ["-o", "ControlMaster=no", "-o", f"ControlPath={path}"]
+
+    def release(self, server: ServerConfig) -> None:
+        """Mark one command started through ``ssh_options`` as finished."""
+        key = self._key(server)
+        with self._lock:
+            count = self._in_use.get(key, 0) - 1
+            if count > 0:
+                self._in_use[key] = count
+            else:
+                self._in_use.pop(key, None)
+            conn = self._connections.get(key)
+            if conn:
+                # Idle time counts from the end of the last command, not its start.
+                conn.last_used = time.monotonic()
+
+    def _close_path(self, path: str) -> None:
+        # ``-O exit`` needs a destination but ignores it when talking to the socket.
+        cmd = [self.ssh_binary, "-o", f"ControlPath={path}", "-O", "exit", "localhost"]
+        try:
+            subprocess.run(cmd, capture_output=True, timeout=self.connect_timeout, check=False)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def close(self, server: ServerConfig) -> None:
+        with self._lock:
+            conn = self._connections.pop(self._key(server), None)
+        if conn:
+            self._close_path(conn.control_path)
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            self._close_path(conn.control_path)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "disabled": self.disabled,
+                "size": len(self._connections),
+                "max_size": self.max_size,
+                "in_use": sum(self._in_use.values()),
+                "idle_seconds": {key: round(now - conn.last_used, 1) for key, conn in self._connections.items()},
+                "backing_off": sum(1 for failed_at in self._failures.values() if now - failed_at < self.failure_backoff),
+            }
+
+
+class OutputBuffer:
+    """Keep the first and last bytes of a stream within ``limit`` and count the rest.
+
+    Memory stays at ``limit`` bytes however much the command prints; the text
+    view marks the omitted middle.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.tail_limit = limit // 2
+        self.head_limit = limit - self.tail_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data and self.tail_limit:
+            self.tail += data[-self.tail_limit:]
+            if len(self.tail) > self.tail_limit:
+                del self.tail[: len(self.tail) - self.tail_limit]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.head) + len(self.tail)
+
+    def text(self) -> str:
+        head = self.head.decode("utf-8", errors="replace")
+        tail = self.tail.decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total - len(self.head) - len(self.tail)
+        return f"{head}\n... [{omitted} bytes omitted] ...\n{tail}"
+
+
+OutputCallback = Callable[[str, str], None]
+
+
+def _kill(proc: subprocess.Popen | asyncio.subprocess.Process) -> None:
+    """Kill ``proc`` and anything it started (it leads its own session)."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+def _pump(
+    stream: IO[bytes],
+    name: str,
+    buffer: OutputBuffer,
+    on_output: OutputCallback | None,
+    over_limit: Callable[[], bool],
+) -> None:
+    """Copy ``stream`` into ``buffer`` chunk by chunk until EOF or the byte limit."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace") if on_output else None
+    while True:
+        chunk = stream.read1(65536) if hasattr(stream, "read1") else stream.read(65536)
+        if not chunk:
+            break
+        buffer.write(chunk)
+        if decoder:
+            on_output(name, decoder.decode(chunk))
+        if over_limit():
+            break
+    stream.close()
 
 
 class RemoteExecutor:
-    def __init__(self, servers: dict[str, ServerConfig], timeout_seconds: int, max_output_chars: int) -> None:
+    def __init__(
+        self,
+        servers: dict[str, ServerConfig],
+        timeout_seconds: int,
+        max_output_chars: int,
+        pool: SSHConnectionPool | None = None,
+        ssh_binary: str = "ssh",
+        fanout_concurrency: int = 8,
+        max_output_bytes: int = 0,
+    ) -> None:
         self.servers = servers
         self.timeout_seconds = timeout_seconds
         self.max_output_chars = max_output_chars
+        self.pool = pool
+        self.ssh_binary = pool.ssh_binary if pool else ssh_binary
+        self.fanout_concurrency = fanout_concurrency
+        self.max_output_bytes = max_output_bytes
 
-    def run_remote_script(self, server_name: str, script: str) -> dict:
+    def _unknown_server(self, server_name: str) -> dict:
+        return {
+            "ok": False,
+            "error": f"Unknown server '{server_name}'. Available: {', '.join(self.servers.keys())}",
+        }
+
+    def _ssh_command(self, server: ServerConfig, script: str, pool_options: list[str]) -> list[str]:
+        ssh_cmd = ssh_base_command(server, self.ssh_binary)
+        ssh_cmd.extend(pool_options)
+        ssh_cmd.extend([f"{server.user}@{server.host}", "bash -lc " + shlex.quote(script)])
+        return ssh_cmd
+
+    def _new_buffers(self) -> dict[str, OutputBuffer]:
+        return {"stdout": OutputBuffer(self.max_output_chars), "stderr": OutputBuffer(self.max_output_chars)}
+
+    def _over_limit(self, buffers: dict[str, OutputBuffer]) -> bool:
+        return bool(self.max_output_bytes) and sum(b.total for b in buffers.values()) > self.max_output_bytes
+
+    def _result(
+        self,
+        server: ServerConfig,
+        script: str,
+        returncode: int | None,
+        buffers: dict[str, OutputBuffer],
+        timeout: int,
+        timed_out: bool,
+        limit_hit: bool,
+    ) -> dict:
+        result = {
+            "ok": returncode == 0 and not timed_out and not limit_hit,
+            "server": asdict(server),
+            "script": script,
+            "returncode": returncode,
+            "stdout": buffers["stdout"].text(),
+            "stderr": buffers["stderr"].text(),
+            "stdout_bytes": buffers["stdout"].total,
+            "stderr_bytes": buffers["stderr"].total,
+            "truncated": any(buffer.truncated for buffer in buffers.values()),
+        }
+        if timed_out:
+            result["error"] = f"Timed out after {timeout} seconds"
+        elif limit_hit:
+            result["error"] = f"Output exceeded {self.max_output_bytes} bytes; command terminated"
+        return result
+
+    def run_remote_script(
+        self,
+        server_name: str,
+        script: str,
+        timeout_seconds: int | None = None,
+        on_output: OutputCallback | None = None,
+    ) -> dict:
+        """Run ``script`` on ``server_name`` and capture its output in bounded memory.
+
+        stdout and stderr are each kept as head and tail within
+        ``max_output_chars`` bytes. The command is killed once both streams
+        together exceed ``max_output_bytes``. ``on_output(stream, text)`` is
+        called from the reader threads with every chunk as it arrives.
+        """
         if server_name not in self.servers:
-            return {
-                "ok": False,
-                "error": f"Unknown server '{server_name}'. Available: {', '.join(self.servers.keys())}",
-            }
+            return self._unknown_server(server_name)
 
         server = self.servers[server_name]
-        ssh_target = f"{server.user}@{server.host}"
+        pool_options = self.pool.ssh_options(server) if self.pool else []
+        try:
+            return self._run(server, script, pool_options, timeout_seconds or self.timeout_seconds, on_output)
+        finally:
+            if pool_options:
+                self.pool.release(server)
 
-        ssh_cmd = ["ssh", "-p", str(server.port)]
-        if server.key_path:
-            ssh_cmd.extend(["-i", server.key_path])
-        if not server.strict_host_key_checking:
-            ssh_cmd.extend(["-o", "StrictHostKeyChecking=no", "-o", "UserKnownHostsFile=/dev/null"])
-        ssh_cmd.extend([ssh_target, "bash -lc " + shlex.quote(script)])
+    def _run(
+        self,
+        server: ServerConfig,
+        script: str,
+        pool_options: list[str],
+        timeout: int,
+        on_output: OutputCallback | None,
+    ) -> dict:
+        ssh_cmd = self._ssh_command(server, script, pool_options)
+        proc = subprocess.Popen(
+            ssh_cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        buffers = self._new_buffers()
+        limit_hit = threading.Event()
 
-        try:
-            proc = subprocess.run(
-                ssh_cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_seconds,
-                check=False,
+        def over_limit() -> bool:
+            if self._over_limit(buffers):
+                if not limit_hit.is_set():
+                    limit_hit.set()
+                    _kill(proc)
+                return True
+            return False
+
+        readers = [
+            threading.Thread(
+                target=_pump,
+                args=(getattr(proc, name), name, buffer, on_output, over_limit),
+                daemon=True,
             )
+            for name, buffer in buffers.items()
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        try:
+            proc.wait(timeout=timeout)
         except subprocess.TimeoutExpired:
-            return {
-                "ok": False,
-                "server": asdict(server),
-                "script": script,
-                "error": f"Timed out after {self.timeout_seconds} seconds",
-            }
+            timed_out = True
+            _kill(proc)
+            proc.wait()
+        for reader in readers:
+            reader.join()
+
+        return self._result(server, script, proc.returncode, buffers, timeout, timed_out, limit_hit.is_set())
+
+    def resolve_servers(self, targets: str | list[str]) -> tuple[list[str], list[str]]:
+        """Expand server names and glob patterns (``web-*``, ``*``) in config order.
+
+        ``targets`` is a list or a comma-separated string. Returns the matched
+        server names and the patterns that matched nothing.
+        """
+        if isinstance(targets, str):
+            targets = [item.strip() for item in targets.split(",") if item.strip()]
+        matched: list[str] = []
+        unmatched: list[str] = []
+        for pattern in targets:
+            names = [name for name in self.servers if fnmatch.fnmatchcase(name, pattern)]
+            if not names:
+                unmatched.append(pattern)
+            matched.extend(name for name in names if name not in matched)
+        return matched, unmatched
 
-        stdout = (proc.stdout or "")[: self.max_output_chars]
-        stderr = (proc.stderr or "")[: self.max_output_chars]
+    @staticmethod
+    def _host_result(result: dict, started: float) -> dict:
+        result.pop("script", None)
+        result["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        return result
+
+    @staticmethod
+    def _fanout_result(script: str, results: dict[str, dict], unmatched: list[str], started: float) -> dict:
+        succeeded = sum(1 for result in results.values() if result.get("ok"))
         return {
-            "ok": proc.returncode == 0,
-            "server": asdict(server),
+            "ok": bool(results) and succeeded == len(results) and not unmatched,
             "script": script,
-            "returncode": proc.returncode,
-            "stdout": stdout,
-            "stderr": stderr,
-            "truncated": len(proc.stdout or "") > self.max_output_chars
-            or len(proc.stderr or "") > self.max_output_chars,
+            "results": results,
+            "unmatched": unmatched,
+            "summary": {
+                "servers": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "elapsed_seconds": round(time.monotonic() - started, 3),
+            },
         }
+
+    def run_on_servers(
+        self,
+        targets: str | list[str],
+        script: str,
+        timeout_seconds: int | None = None,
+        max_concurrency: int | None = None,
+        on_output: Callable[[str, str, str], None] | None = None,
+    ) -> dict:
+        """Run ``script`` on every matching server, at most ``max_concurrency`` at a time.
+
+        Each host gets its own timeout; the per-host results are keyed by
+        server name in config order. ``on_output(server, stream, text)``
+        receives every host's output as it arrives.
+        """
+        names, unmatched = self.resolve_servers(targets)
+        started = time.monotonic()
+
+        def run_one(name: str) -> dict:
+            host_started = time.monotonic()
+            host_output = (lambda stream, text: on_output(name, stream, text)) if on_output else None
+            result = self.run_remote_script(name, script, timeout_seconds=timeout_seconds, on_output=host_output)
+            return self._host_result(result, host_started)
+
+        results: dict[str, dict] = {}
+        if names:
+            workers = max(1, min(max_concurrency or self.fanout_concurrency, len(names)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fanout") as pool:
+                for name, result in zip(names, pool.map(run_one, names)):
+                    results[name] = result
+        return self._fanout_result(script, results, unmatched, started)
+
+
+class AsyncRemoteExecutor(RemoteExecutor):
+    """asyncio-native variant of :class:`RemoteExecutor` for the MCP server.
+
+    Commands run under ``asyncio.create_subprocess_exec`` so a slow command
+    holds no thread. At most ``max_concurrency`` commands run at once overall
+    and ``per_server_concurrency`` per server; further calls wait for a slot.
+    Cancelling a call kills its ``ssh`` process. The synchronous methods are
+    inherited unchanged.
+    """
+
+    def __init__(self, *args, max_concurrency: int = 32, per_server_concurrency: int = 4, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.per_server_concurrency = per_server_concurrency
+        self._global_slots = asyncio.Semaphore(max_concurrency)
+        self._server_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def arun_remote_script(
+        self,
+        server_name: str,
+        script: str,
+        timeout_seconds: int | None = None,
+        on_output: OutputCallback | None = None,
+    ) -> dict:
+        if server_name not in self.servers:
+            return self._unknown_server(server_name)
+
+        server = self.servers[server_name]
+        slots = self._server_slots.setdefault(server_name, asyncio.Semaphore(self.per_server_concurrency))
+        # Wait for the server's slot first so a busy host does not hold a global one.
+        async with slots, self._global_slots:
+            # Opening a pooled master blocks on ssh; keep it off the event loop.
+            pool_options = await asyncio.to_thread(self.pool.ssh_options, server) if self.pool else []
+            try:
+                return await self._arun(server, script, pool_options, timeout_seconds or self.timeout_seconds, on_output)
+            finally:
+                if pool_options:
+                    self.pool.release(server)
+
+    async def _arun(
+        self,
+        server: ServerConfig,
+        script: str,
+        pool_options: list[str],
+        timeout: int,
+        on_output: OutputCallback | None,
+    ) -> dict:
+        proc = await asyncio.create_subprocess_exec(
+            *self._ssh_command(server, script, pool_options),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        buffers = self._new_buffers()
+        limit_hit = False
+
+        async def pump(name: str) -> None:
+            nonlocal limit_hit
+            stream = getattr(proc, name)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace") if on_output else None
+            # Keep reading after a kill: the process only counts as exited once its pipes hit EOF.
+            while chunk := await stream.read(65536):
+                if limit_hit:
+                    continue
+                buffers[name].write(chunk)
+                if decoder:
+                    on_output(name, decoder.decode(chunk))
+                if self._over_limit(buffers):
+                    limit_hit = True
+                    _kill(proc)
+
+        pumps = [asyncio.ensure_future(pump("stdout")), asyncio.ensure_future(pump("stderr"))]
+        timed_out = False
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+            await asyncio.wait(pumps)
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            # Runs on timeout, output limit and cancellation alike: never leave ssh behind.
+            if proc.returncode is None:
+                _kill(proc)
+                await asyncio.shield(proc.wait())
+            for task in pumps:
+                task.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
+        return self._result(server, script, proc.returncode, buffers, timeout, timed_out, limit_hit)
+
+    async def arun_on_servers(
+        self,
+        targets: str | list[str],
+        script: str,
+        timeout_seconds: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> dict:
+        names, unmatched = self.resolve_servers(targets)
+        started = time.monotonic()
+        fanout_slots = asyncio.Semaphore(max(1, max_concurrency or self.fanout_concurrency))
+
+        async def run_one(name: str) -> dict:
+            async with fanout_slots:
+                host_started = time.monotonic()
+                result = await self.arun_remote_script(name, script, timeout_seconds=timeout_seconds)
+                return self._host_result(result, host_started)
+
+        results = dict(zip(names, await asyncio.gather(*(run_one(name) for name in names))))
+        return self._fanout_result(script, results, unmatched, started)
+
+
+def build_executor(
+    runtime: RuntimeConfig,
+    executor_class: type[RemoteExecutor] = RemoteExecutor,
+    **kwargs,
+) -> RemoteExecutor:
+    """Create the executor (and its SSH connection pool, if enabled) for ``runtime``.
+
+    ``executor_class`` selects :class:`AsyncRemoteExecutor`; extra keyword
+    arguments go to its constructor.
+    """
+    pool = None
+    if runtime.connection_pool.enabled:
+        pool = SSHConnectionPool.from_config(runtime.connection_pool, ssh_binary=runtime.ssh_binary)
+    return executor_class(
+        runtime.servers,
+        timeout_seconds=runtime.timeout_seconds,
+        max_output_chars=runtime.max_output_chars,
+        pool=pool,
+        ssh_binary=runtime.ssh_binary,
+        fanout_concurrency=runtime.fanout_concurrency,
+        max_output_bytes=runtime.max_output_bytes,
+        **kwargs,
+    )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from config import ResultCacheConfig
+
+# Only scripts made entirely of these commands are cached. Anything else (shell
+# keywords, sudo, bash -c, ssh, unknown tools) bypasses the cache and clears the
+# server's entries: a false "not read-only" only costs a cache miss.
+READ_ONLY_COMMANDS = frozenset({
+    "cat", "head", "tail", "grep", "egrep", "fgrep", "zgrep", "zcat", "wc", "cut", "tr",
+    "sort", "column", "nl", "awk", "find", "ls", "stat", "file", "readlink", "realpath",
+    "basename", "dirname", "pwd", "echo", "printf", "md5sum", "sha1sum", "sha256sum",
+    "df", "du", "free", "uptime", "uname", "hostname", "whoami", "id", "groups", "getent",
+    "who", "w", "last", "date", "nproc", "lscpu", "lsblk", "findmnt", "getconf",
+    "printenv", "which", "ps", "pgrep", "top", "vmstat", "iostat", "mpstat", "sar",
+    "netstat", "ss", "lsof", "dmesg", "journalctl", "systemctl", "crontab", "jps", "jstat",
+    "true", "test", "[",
+})
+
+# Arguments that make an otherwise read-only command write, delete or run something.
+UNSAFE_ARGUMENTS = {
+    "find": ("-delete", "-exec", "-execdir", "-ok", "-okdir", "-fprint", "-fprint0", "-fprintf", "-fls"),
+    "sort": ("-o", "--output"),
+    "date": ("-s", "--set"),
+    "dmesg": ("-c", "-C", "--clear", "--read-clear"),
+    "journalctl": ("--vacuum-size", "--vacuum-time", "--vacuum-files", "--rotate", "--flush", "--sync"),
+    "hostname": ("-F", "--file", "-b", "--boot"),
+    "sar": ("-o",),
+    "ss": ("-K", "--kill"),
+}
+
+# Commands that are read-only only with one of these subcommands / options.
+READ_ONLY_SUBCOMMANDS = {
+    "systemctl": {"status", "is-active", "is-enabled", "is-failed", "show", "list-units", "list-unit-files", "cat"},
+    "crontab": {"-l"},
+}
+
+# Command separators: newlines, ;, |, ||, &&, and & except inside 2>&1 and &>.
+_SEPARATOR = re.compile(r"\|\||&&|[;|\n]|(?<![<>])&(?!>)")
+# Command substitution, process substitution and redirection to anything but /dev/null or a descriptor.
+_UNSAFE_SYNTAX = re.compile(r"`|\$\(|[<>]\(|>(?!>?\s*/dev/null\b|&\d)")
+
+
+def _has_argument(args: list[str], flag: str) -> bool:
+    if flag.startswith("--") or len(flag) > 2:
+        return any(arg == flag or arg.startswith(flag + "=") for arg in args)
+    # A short option may be combined with others (-ro) or carry its value (-ofile).
+    return any(arg.startswith("-") and not arg.startswith("--") and flag[1] in arg[1:] for arg in args)
+
+
+def _is_read_only_command(segment: str) -> bool:
+    words = segment.split()
+    if not words:
+        return True
+    command, args = words[0], words[1:]
+    if command not in READ_ONLY_COMMANDS:
+        return False
+    if command == "awk" and ("system" in segment or "getline" in segment):
+        return False
+    if command == "hostname" and any(not arg.startswith("-") for arg in args):
+        return False
+    if any(_has_argument(args, flag) for flag in UNSAFE_ARGUMENTS.get(command, ())):
+        return False
+    subcommands = READ_ONLY_SUBCOMMANDS.get(command)
+    return subcommands is None or bool(args) and args[0] in subcommands
+
+
+def is_read_only(script: str) -> bool:
+    """True if every command in ``script`` is a known read-only command."""
+    if _UNSAFE_SYNTAX.search(script):
+        return False
+    return all(_is_read_only_command(segment) for segment in _SEPARATOR.split(script))
+
+
+def cache_key(server_name: str, script: str) -> tuple[str, str]:
+    # Only surrounding whitespace is ignored: quoting, newlines and comments can all change
+    # what a script does, so any other difference is a different command.
+    return server_name, script.strip()
+
+
+class ResultCache:
+    """Short-lived LRU cache of successful read-only command results.
+
+    Entries are keyed by server and exact script text and expire after
+    ``ttl`` seconds. The least recently used entries are evicted beyond
+    ``max_entries`` or ``max_bytes`` of captured output. Only scripts made of
+    known read-only commands are cached; running any other script drops the
+    server's cached entries, since their output may no longer be current.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[float, int, dict]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, cfg: ResultCacheConfig) -> ResultCache:
+        return cls(ttl=cfg.ttl_seconds, max_entries=cfg.max_entries, max_bytes=cfg.max_bytes)
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, server_name: str, script: str) -> dict | None:
+        """Return a copy of the cached result marked ``cached``, or None on a miss."""
+        if not is_read_only(script):
+            return None
+        key = cache_key(server_name, script)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] > self.ttl:
+                self._drop(key)
+                entry = None
+            if not entry:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return dict(entry[2], cached=True, cached_age_seconds=round(now - entry[0], 3))
+
+    def put(self, server_name: str, script: str, result: dict) -> dict:
+        """Store ``result`` if it is cacheable; returns it marked ``cached: False``."""
+        result = dict(result, cached=False)
+        if not is_read_only(script):
+            self.invalidate(server_name)
+            return result
+        if not result.get("ok"):
+            return result
+        size = len(result.get("stdout") or "") + len(result.get("stderr") or "")
+        if size > self.max_bytes:
+            return result
+        key = cache_key(server_name, script)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic(), size, result)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+        return result
+
+    def invalidate(self, server_name: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == server_name]:
+                self._drop(key)
+
+    def record_run(self, server_names: list[str], script: str) -> None:
+        """Drop the entries of ``server_names`` after ``script`` ran on them uncached, unless it is read-only."""
+        if not is_read_only(script):
+            for server_name in server_names:
+                self.invalidate(server_name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
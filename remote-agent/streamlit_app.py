@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
+from typing import Any, Callable, Iterator
 
 import streamlit as st
-from openai import OpenAI
 
 from config import RuntimeConfig, ServerConfig, load_config
-from remote_exec import RemoteExecutor
+from history import HistoryManager, HistoryStats, OutputStore
+from remote_exec import RemoteExecutor, build_executor
 
 
 def config_editor(default_path: str = "config.yaml") -> RuntimeConfig:
@@ -58,64 +64,335 @@ def config_editor(default_path: str = "config.yaml") -> RuntimeConfig:
     return runtime
 
 
-def run_agent(runtime: RuntimeConfig, user_prompt: str, chat_history: list[dict]) -> tuple[str, list[dict]]:
-    client = OpenAI(api_key=runtime.openai_api_key)
-    executor = RemoteExecutor(runtime.servers, runtime.timeout_seconds, runtime.max_output_chars)
-
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "run_remote_script",
-                "description": "Run a command/script on one configured remote server",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "server_name": {"type": "string"},
-                        "script": {"type": "string"},
-                    },
-                    "required": ["server_name", "script"],
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "run_remote_script",
+            "description": "Run a command/script on one configured remote server",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "server_name": {"type": "string"},
+                    "script": {"type": "string"},
                 },
+                "required": ["server_name", "script"],
             },
-        }
-    ]
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "run_on_servers",
+            "description": (
+                "Run the same command/script on several configured servers in parallel. "
+                "Servers are names or glob patterns such as 'soa-*' or '*'."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "servers": {"type": "array", "items": {"type": "string"}},
+                    "script": {"type": "string"},
+                    "timeout_seconds": {"type": "integer", "description": "Per-server timeout"},
+                },
+                "required": ["servers", "script"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_tool_output",
+            "description": (
+                "Fetch the full output of an earlier tool call that was compacted in the history "
+                "(results marked \"compacted\": true carry its ref)"
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {"ref": {"type": "string"}},
+                "required": ["ref"],
+            },
+        },
+    },
+]
+
+
+OutputCallback = Callable[[str, str, str], None]
+
+
+def call_tool(
+    executor: RemoteExecutor,
+    name: str,
+    args: dict,
+    on_output: OutputCallback | None = None,
+    store: OutputStore | None = None,
+) -> dict:
+    """Dispatch one tool call; ``on_output(server, stream, text)`` receives live command output."""
+    if name == "get_tool_output":
+        return store.get(args["ref"]) if store else {"ok": False, "error": "No output store in this session"}
+    if name == "run_remote_script":
+        server_name = args["server_name"]
+        host_output = (lambda stream, text: on_output(server_name, stream, text)) if on_output else None
+        return executor.run_remote_script(server_name=server_name, script=args["script"], on_output=host_output)
+    if name == "run_on_servers":
+        return executor.run_on_servers(
+            args["servers"], args["script"], timeout_seconds=args.get("timeout_seconds"), on_output=on_output
+        )
+    return {"ok": False, "error": f"Unknown tool '{name}'"}
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_openai_client(api_key: str) -> Any:
+    """One OpenAI client per API key, so its HTTP keep-alive pool survives reruns."""
+    from openai import OpenAI  # deferred: Streamlit reruns that never prompt skip the import
+
+    return OpenAI(api_key=api_key)
+
+
+def executor_fingerprint(runtime: RuntimeConfig) -> str:
+    """Hash of everything the executor is built from (servers and execution settings)."""
+    settings = asdict(runtime)
+    for key in (
+        "openai_api_key",
+        "model",
+        "system_prompt",
+        "tool_concurrency",
+        "history_token_budget",
+        "tool_excerpt_chars",
+        "healthcheck",
+    ):
+        settings.pop(key, None)
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_executor(fingerprint: str, _runtime: RuntimeConfig) -> RemoteExecutor:
+    """Executor shared across reruns; a config or sidebar change yields a new fingerprint."""
+    return build_executor(_runtime)
+
+
+def run_tool_calls(
+    executor: RemoteExecutor,
+    tool_calls: list[dict],
+    max_workers: int,
+    on_output: Callable[[str, str, str, str], None] | None = None,
+    store: OutputStore | None = None,
+) -> list[tuple[dict, float]]:
+    """Run one turn's tool calls on a bounded pool; returns (result, seconds) in call order.
+
+    ``on_output(call_id, server, stream, text)`` receives live output tagged
+    with the tool call it belongs to.
+    """
+
+    def run(tool_call: dict) -> tuple[dict, float]:
+        started = time.monotonic()
+        args = json.loads(tool_call["function"]["arguments"])
+        call_output = (lambda *chunk: on_output(tool_call["id"], *chunk)) if on_output else None
+        result = call_tool(executor, tool_call["function"]["name"], args, on_output=call_output, store=store)
+        return result, time.monotonic() - started
+
+    if len(tool_calls) == 1:
+        return [run(tool_calls[0])]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tool_calls)))) as pool:
+        return list(pool.map(run, tool_calls))
+
+
+def stream_completion(client: Any, runtime: RuntimeConfig, messages: list[dict]) -> Iterator[tuple]:
+    """Stream one model response.
+
+    Yields ``("token", text)`` events as content arrives, then
+    ``("message", assistant_message)`` with the tool-call fragments assembled.
+    """
+    content: list[str] = []
+    tool_calls: dict[int, dict] = {}
+    stream = client.chat.completions.create(
+        model=runtime.model,
+        messages=messages,
+        tools=TOOLS,
+        tool_choice="auto",
+        temperature=0.1,
+        stream=True,
+    )
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content.append(delta.content)
+            yield ("token", delta.content)
+        for fragment in delta.tool_calls or []:
+            call = tool_calls.setdefault(
+                fragment.index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
+            )
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.function:
+                call["function"]["name"] += fragment.function.name or ""
+                call["function"]["arguments"] += fragment.function.arguments or ""
+
+    message: dict[str, Any] = {"role": "assistant", "content": "".join(content) or None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+    yield ("message", message)
+
+
+def agent_events(
+    runtime: RuntimeConfig,
+    user_prompt: str,
+    chat_history: list[dict],
+    history: HistoryManager | None = None,
+) -> Iterator[tuple]:
+    """Run the agent loop and yield UI events as they happen.
+
+    Events: ``("turn",)`` before each model call, ``("token", text)``,
+    ``("tool_start", call_id, name, args)``, ``("tool_output", call_id, server,
+    stream, text)``, ``("tool_end", call_id, name, args, result, seconds)`` and
+    finally ``("done", answer, history)``. Tool output is relayed from the worker
+    threads through a queue, so every event is yielded on the caller's thread.
+    With a ``history`` manager, old tool results are compacted to its token
+    budget before every model call, and the returned history keeps them compacted.
+    """
+    client = get_openai_client(runtime.openai_api_key)
+    executor = get_executor(executor_fingerprint(runtime), runtime)
 
     messages = [{"role": "system", "content": runtime.system_prompt}] + chat_history + [
         {"role": "user", "content": user_prompt}
     ]
 
     for _ in range(4):
-        response = client.chat.completions.create(
-            model=runtime.model,
-            messages=messages,
-            tools=tools,
-            tool_choice="auto",
-            temperature=0.1,
-        )
-        choice = response.choices[0].message
+        yield ("turn",)
+        if history:
+            messages = history.compact(messages)
+        message: dict = {}
+        for event in stream_completion(client, runtime, messages):
+            if event[0] == "message":
+                message = event[1]
+            else:
+                yield event
 
-        if not choice.tool_calls:
-            content = choice.content or "No response generated."
+        if not message.get("tool_calls"):
+            content = message.get("content") or "No response generated."
             messages.append({"role": "assistant", "content": content})
-            return content, messages[1:]  # omit system message in session
-
-        messages.append(choice.model_dump())
-        for tool_call in choice.tool_calls:
-            args = json.loads(tool_call.function.arguments)
-            tool_result = executor.run_remote_script(
-                server_name=args["server_name"],
-                script=args["script"],
+            yield ("done", content, messages[1:])  # omit system message in session
+            return
+
+        messages.append(message)
+        tool_calls = message["tool_calls"]
+        call_args = {call["id"]: json.loads(call["function"]["arguments"]) for call in tool_calls}
+        for call in tool_calls:
+            yield ("tool_start", call["id"], call["function"]["name"], call_args[call["id"]])
+
+        output: queue.Queue = queue.Queue()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tools") as background:
+            future = background.submit(
+                run_tool_calls,
+                executor,
+                tool_calls,
+                runtime.tool_concurrency,
+                lambda *chunk: output.put(("tool_output",) + chunk),
+                history.store if history else None,
             )
+            while not (future.done() and output.empty()):
+                try:
+                    yield output.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            outcomes = future.result()
+
+        for call, (tool_result, elapsed) in zip(tool_calls, outcomes):
+            name = call["function"]["name"]
+            yield ("tool_end", call["id"], name, call_args[call["id"]], tool_result, elapsed)
             messages.append(
                 {
                     "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": "run_remote_script",
+                    "tool_call_id": call["id"],
+                    "name": name,
                     "content": json.dumps(tool_result),
                 }
             )
 
-    return "Agent stopped after max tool-iteration limit.", messages[1:]
+    yield ("done", "Agent stopped after max tool-iteration limit.", messages[1:])
+
+
+ToolCallCallback = Callable[[str, dict, dict, float], None]
+
+
+def run_agent(
+    runtime: RuntimeConfig,
+    user_prompt: str,
+    chat_history: list[dict],
+    on_tool_call: ToolCallCallback | None = None,
+    history: HistoryManager | None = None,
+) -> tuple[str, list[dict]]:
+    """Run the agent to completion and return (answer, history) without live updates."""
+    for event in agent_events(runtime, user_prompt, chat_history, history):
+        if event[0] == "tool_end" and on_tool_call:
+            on_tool_call(*event[2:])
+        elif event[0] == "done":
+            return event[1], event[2]
+    raise RuntimeError("agent loop ended without an answer")
+
+
+def tool_target(args: dict) -> str:
+    return args.get("server_name") or ", ".join(args.get("servers", []))
+
+
+def render_agent_turn(
+    runtime: RuntimeConfig,
+    prompt: str,
+    chat_history: list[dict],
+    history: HistoryManager | None = None,
+) -> list[dict]:
+    """Render the agent's reply live: streamed text, one status box per tool call with its output."""
+    tool_area = st.container()
+    answer_slot = st.empty()
+    text = ""
+    calls: dict[str, dict] = {}
+    timings: list[str] = []
+    updated_history = chat_history
+
+    for event in agent_events(runtime, prompt, chat_history, history):
+        kind = event[0]
+        if kind == "turn":
+            if text:
+                answer_slot.markdown(text)
+                answer_slot = st.empty()
+            text = ""
+        elif kind == "token":
+            text += event[1]
+            answer_slot.markdown(text + "▌")
+        elif kind == "tool_start":
+            _, call_id, name, args = event
+            with tool_area:
+                status = st.status(f"`{name}` on {tool_target(args)}", expanded=True)
+            calls[call_id] = {
+                "status": status,
+                "slot": status.empty(),
+                "output": "",
+                "fanout": name == "run_on_servers",
+            }
+        elif kind == "tool_output":
+            _, call_id, server, _stream, chunk = event
+            call = calls[call_id]
+            prefix = f"[{server}] " if call["fanout"] else ""
+            # Keep only the tail on screen; the full (bounded) result still goes to the model.
+            call["output"] = (call["output"] + prefix + chunk)[-4000:]
+            call["slot"].code(call["output"])
+        elif kind == "tool_end":
+            _, call_id, name, args, result, elapsed = event
+            state = "complete" if result.get("ok") else "error"
+            label = f"`{name}` on {tool_target(args)}: {elapsed:.2f} s"
+            calls[call_id]["status"].update(label=label, state=state, expanded=False)
+            timings.append(f"{label} ({'ok' if result.get('ok') else 'failed'})")
+        elif kind == "done":
+            answer_slot.markdown(event[1])
+            updated_history = event[2]
+
+    if timings:
+        with st.expander(f"Tool calls ({len(timings)})"):
+            for line in timings:
+                st.markdown(f"- {line}")
+    return updated_history
 
 
 def main() -> None:
@@ -127,6 +404,15 @@ def main() -> None:
 
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
+    if "tool_outputs" not in st.session_state:
+        st.session_state.tool_outputs = OutputStore()
+        st.session_state.history_stats = HistoryStats()
+    history = HistoryManager(
+        runtime.history_token_budget,
+        runtime.tool_excerpt_chars,
+        st.session_state.tool_outputs,
+        st.session_state.history_stats,
+    )
 
     for message in st.session_state.chat_history:
         if message["role"] in {"assistant", "user"}:
@@ -139,10 +425,16 @@ def main() -> None:
             st.write(prompt)
 
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                answer, updated_history = run_agent(runtime, prompt, st.session_state.chat_history)
-                st.write(answer)
-                st.session_state.chat_history = updated_history
+            st.session_state.chat_history = render_agent_turn(
+                runtime, prompt, st.session_state.chat_history, history
+            )
+
+    stats = st.session_state.history_stats
+    if stats.compacted:
+        st.sidebar.caption(
+            f"History: ~{stats.last_tokens} tokens sent; {stats.compacted} tool results compacted, "
+            f"~{stats.tokens_saved} tokens saved"
+        )
 
 
 if __name__ == "__main__":
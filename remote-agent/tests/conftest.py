@@ -0,0 +1,72 @@
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+# The agent modules import each other as top-level modules (`from config import ...`).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Stand-in for OpenSSH: a master is a socket file at ControlPath, and every
+# invocation is logged as master/check/exit/mux/direct. Masters for hosts
+# starting with "down" fail to open.
+FAKE_SSH = textwrap.dedent(
+    """\
+    #!{python}
+    import os, shlex, subprocess, sys
+
+    args, opts, operation, rest = sys.argv[1:], {{}}, None, []
+    i = 0
+    while i < len(args):
+        if args[i] == "-o":
+            key, _, value = args[i + 1].partition("=")
+            opts[key] = value
+            i += 2
+        elif args[i] in ("-p", "-i"):
+            i += 2
+        elif args[i] == "-O":
+            operation = args[i + 1]
+            i += 2
+        elif args[i] in ("-N", "-f"):
+            i += 1
+        else:
+            rest.append(args[i])
+            i += 1
+    path = opts.get("ControlPath")
+    target = rest[0].split("@")[-1] if rest else ""
+
+    def log(event):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ssh.log"), "a") as handle:
+            handle.write(f"{{event}} {{target}}\\n")
+
+    if operation == "check":
+        log("check")
+        sys.exit(0 if os.path.exists(path) else 255)
+    if operation == "exit":
+        log("exit")
+        if os.path.exists(path):
+            os.remove(path)
+        sys.exit(0)
+    if opts.get("ControlMaster") == "yes":
+        log("master")
+        if target.startswith("down"):
+            sys.exit(255)
+        open(path, "w").close()
+        sys.exit(0)
+    log("mux" if path and os.path.exists(path) else "direct")
+    sys.exit(subprocess.call(["bash", "-c", shlex.split(rest[-1])[-1]]))
+    """
+)
+
+
+@pytest.fixture
+def fake_ssh(tmp_path):
+    script = tmp_path / "ssh"
+    script.write_text(FAKE_SSH.format(python=sys.executable))
+    script.chmod(0o755)
+    log = tmp_path / "ssh.log"
+
+    def events() -> list[str]:
+        return log.read_text().splitlines() if log.exists() else []
+
+    return str(script), events
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class FakeFastMCP:
+    """Stand-in for ``fastmcp.FastMCP`` that keeps the registered tools callable."""
+
+    def __init__(self, name):
+        self.tools = {}
+
+    def tool(self, **kwargs):
+        def register(func):
+            self.tools[func.__name__] = func
+            return func
+
+        return register
+
+    def resource(self, *args, **kwargs):
+        return lambda func: func
+
+
+@pytest.fixture
+def tools(tmp_path, fake_ssh, monkeypatch):
+    monkeypatch.setitem(sys.modules, "fastmcp", types.SimpleNamespace(FastMCP=FakeFastMCP))
+    monkeypatch.delitem(sys.modules, "fastmcp_server", raising=False)
+    ssh_binary, _ = fake_ssh
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        f"""\
+openai:
+  api_key: "test"
+servers:
+  app1: {{host: "app1", user: "opc"}}
+  app2: {{host: "app2", user: "opc"}}
+execution:
+  ssh_binary: "{ssh_binary}"
+  connection_pool:
+    control_dir: "{tmp_path / 'control'}"
+  result_cache:
+    enabled: true
+    ttl_seconds: 60
+"""
+    )
+    return importlib.import_module("fastmcp_server").build_mcp(str(config)).tools
+
+
+def test_run_on_servers_clears_cached_results(tools, tmp_path):
+    state = tmp_path / "state"
+    state.write_text("old\n")
+
+    async def scenario():
+        before = await tools["run_remote_script"]("app1", f"cat {state}")
+        cached = await tools["run_remote_script"]("app1", f"cat {state}")
+        await tools["run_on_servers"](["app*"], f"echo new > {state}")
+        after = await tools["run_remote_script"]("app1", f"cat {state}")
+        return before, cached, after
+
+    before, cached, after = asyncio.run(scenario())
+
+    assert (before["stdout"], cached["cached"]) == ("old\n", True)
+    assert (after["stdout"], after["cached"]) == ("new\n", False)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from config import ConnectionPoolConfig, RuntimeConfig, ServerConfig
+from remote_exec import AsyncRemoteExecutor, RemoteExecutor, SSHConnectionPool, build_executor
+
+
+def make_executor(tmp_path, ssh_binary, hosts, executor_class=RemoteExecutor, **pool):
+    control_dir = tmp_path / "control"
+    runtime = RuntimeConfig(
+        openai_api_key="",
+        model="",
+        system_prompt="",
+        timeout_seconds=10,
+        max_output_chars=1000,
+        servers={host: ServerConfig(host=host, user="opc") for host in hosts},
+        ssh_binary=ssh_binary,
+        connection_pool=ConnectionPoolConfig(control_dir=str(control_dir), **pool),
+    )
+    return build_executor(runtime, executor_class)
+
+
+def test_commands_reuse_one_master(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    executor = make_executor(tmp_path, ssh_binary, ["app1"])
+
+    first = executor.run_remote_script("app1", "echo one")
+    second = executor.run_remote_script("app1", "echo two")
+
+    assert (first["stdout"], second["stdout"]) == ("one\n", "two\n")
+    assert events() == ["master app1", "mux app1", "mux app1"]
+
+
+def test_dead_master_is_reopened_after_health_check(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    executor = make_executor(tmp_path, ssh_binary, ["app1"], health_check_seconds=0)
+    executor.run_remote_script("app1", "true")
+    for name in os.listdir(executor.pool.control_dir):
+        os.remove(os.path.join(executor.pool.control_dir, name))
+
+    assert executor.run_remote_script("app1", "true")["ok"]
+    assert events() == ["master app1", "mux app1", "master app1", "mux app1"]
+
+
+def test_least_recently_used_master_is_closed(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    executor = make_executor(tmp_path, ssh_binary, ["app1", "app2", "app3"], max_size=2)
+    for host in ("app1", "app2", "app1", "app3"):
+        executor.run_remote_script(host, "true")
+
+    # app2 was used least recently, so opening app3's master closed it.
+    assert events()[-3:] == ["exit localhost", "master app3", "mux app3"]
+    assert len(os.listdir(executor.pool.control_dir)) == 2
+    executor.run_remote_script("app1", "true")
+    assert events()[-1] == "mux app1"
+
+
+def test_busy_master_is_not_closed(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    executor = make_executor(tmp_path, ssh_binary, ["app1", "app2", "app3"], max_size=2)
+    release = tmp_path / "release"
+    started = tmp_path / "started"
+    script = f"touch {started}; while [ ! -e {release} ]; do sleep 0.05; done; echo done"
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(executor.run_remote_script("app1", script)))
+    worker.start()
+    while not started.exists():
+        time.sleep(0.01)
+
+    # app1 is the oldest master but still busy, so app2 goes when app3 opens.
+    executor.run_remote_script("app2", "true")
+    executor.run_remote_script("app3", "true")
+    release.touch()
+    worker.join()
+
+    assert result["stdout"] == "done\n"
+    assert events() == ["master app1", "mux app1", "master app2", "mux app2", "exit localhost", "master app3", "mux app3"]
+    assert sorted(os.listdir(executor.pool.control_dir)) == sorted(
+        [executor.pool._key(executor.servers[host]) for host in ("app1", "app3")]
+    )
+    assert executor.pool.stats()["in_use"] == 0
+
+
+def test_fanout_beyond_max_size_keeps_its_sessions(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    hosts = [f"app{i}" for i in range(4)]
+    executor = make_executor(tmp_path, ssh_binary, hosts, executor_class=AsyncRemoteExecutor, max_size=2)
+
+    report = asyncio.run(executor.arun_on_servers("app*", "sleep 0.5; echo ok"))
+
+    assert all(result["stdout"] == "ok\n" for result in report["results"].values())
+    assert "exit localhost" not in events()
+    assert executor.pool.stats()["in_use"] == 0
+
+
+def test_failed_master_falls_back_and_backs_off(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    executor = make_executor(tmp_path, ssh_binary, ["down1"], failure_backoff_seconds=60)
+
+    assert executor.run_remote_script("down1", "echo ok")["stdout"] == "ok\n"
+    assert executor.run_remote_script("down1", "echo ok")["stdout"] == "ok\n"
+    assert events() == ["master down1", "direct down1", "direct down1"]
+    assert executor.pool.stats()["backing_off"] == 1
+
+
+def test_master_is_retried_after_backoff(tmp_path, fake_ssh):
+    ssh_binary, events = fake_ssh
+    executor = make_executor(tmp_path, ssh_binary, ["down1"], failure_backoff_seconds=0)
+    executor.run_remote_script("down1", "true")
+    executor.run_remote_script("down1", "true")
+
+    assert events() == ["master down1", "direct down1", "master down1", "direct down1"]
+
+
+@pytest.mark.parametrize("unsafe", ["group_readable", "symlink"])
+def test_unsafe_control_dir_disables_pooling(tmp_path, fake_ssh, unsafe):
+    ssh_binary, events = fake_ssh
+    if unsafe == "group_readable":
+        (tmp_path / "control").mkdir(mode=0o755)
+        (tmp_path / "control").chmod(0o755)
+    else:
+        (tmp_path / "elsewhere").mkdir(mode=0o700)
+        (tmp_path / "control").symlink_to(tmp_path / "elsewhere")
+
+    with pytest.warns(RuntimeWarning, match="connection reuse disabled"):
+        executor = make_executor(tmp_path, ssh_binary, ["app1"])
+
+    assert executor.run_remote_script("app1", "echo ok")["stdout"] == "ok\n"
+    assert events() == ["direct app1"]
+    assert executor.pool.stats()["disabled"]
+
+
+def test_control_dir_prefers_xdg_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    pool = SSHConnectionPool()
+
+    assert pool.control_dir == str(tmp_path / "remote-ops-ssh")
+    assert pool.disabled is None
+    assert stat.S_IMODE(os.lstat(pool.control_dir).st_mode) == 0o700
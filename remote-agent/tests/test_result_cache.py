@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from result_cache import ResultCache, is_read_only
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "uptime",
+        "df -h",
+        "ps aux | grep java",
+        "uptime\ndf -h",
+        "ls -l /tmp 2>&1 | head",
+        "cat /etc/os-release 2>/dev/null",
+        "grep -c ERROR app.log && echo found",
+        "find /var/log -name '*.gz' -mtime +3",
+        "systemctl status nginx",
+        "crontab -l",
+        "awk '{print $5}' data.txt",
+    ],
+)
+def test_read_only_scripts(script):
+    assert is_read_only(script)
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "uptime\nrm -rf /tmp/x",
+        "if true; then rm x; fi",
+        "for f in *; do rm $f; done",
+        "{ rm x; }",
+        "bash -c 'ls'",
+        "sh -c 'rm x'",
+        "ssh host rm x",
+        "sudo ls",
+        "env rm x",
+        "find . -delete",
+        r"find . -exec rm {} \;",
+        "echo hi > out.txt",
+        "cat x 2>/tmp/err",
+        "echo $(rm x)",
+        "echo `rm x`",
+        "echo x | tee out.txt",
+        "systemctl restart nginx",
+        "sort -ro out.txt in.txt",
+        "date -s 10:00",
+        "awk 'BEGIN { system(\"rm x\") }'",
+        "ls & rm x",
+    ],
+)
+def test_other_scripts_are_not_read_only(script):
+    assert not is_read_only(script)
+
+
+def test_scripts_differing_in_quoting_do_not_share_entries():
+    cache = ResultCache(ttl=60, max_entries=8, max_bytes=1024)
+    cache.put("dev", 'echo "a  b"', {"ok": True, "stdout": "a  b\n"})
+    assert cache.get("dev", "echo a  b") is None
+    assert cache.get("dev", ' echo "a  b"\n')["stdout"] == "a  b\n"
+
+
+def test_non_read_only_script_clears_server_entries():
+    cache = ResultCache(ttl=60, max_entries=8, max_bytes=1024)
+    cache.put("dev", "ls /srv", {"ok": True, "stdout": "app\n"})
+    cache.put("prod", "ls /srv", {"ok": True, "stdout": "app\n"})
+    result = cache.put("dev", "ls /srv\nrm -rf /srv/app", {"ok": True, "stdout": ""})
+    assert result["cached"] is False
+    assert cache.get("dev", "ls /srv") is None
+    assert cache.get("prod", "ls /srv") is not None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import contextlib
+import importlib
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from config import RuntimeConfig
+from history import HistoryManager, HistoryStats, OutputStore
+
+
+class _Element(contextlib.nullcontext):
+    """Stand-in for Streamlit containers, placeholders and status boxes."""
+
+    def __getattr__(self, name):
+        if name in ("container", "empty", "status", "expander"):
+            return lambda *args, **kwargs: _Element()
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def app(monkeypatch):
+    streamlit = types.ModuleType("streamlit")
+    streamlit.cache_resource = lambda **kwargs: (lambda func: func)
+    element = _Element()
+    for name in ("container", "empty", "status", "expander", "markdown"):
+        setattr(streamlit, name, getattr(element, name))
+    monkeypatch.setitem(sys.modules, "streamlit", streamlit)
+    monkeypatch.delitem(sys.modules, "streamlit_app", raising=False)
+    return importlib.import_module("streamlit_app")
+
+
+def _chunk(text):
+    delta = SimpleNamespace(content=text, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeClient:
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        self.requests.append(list(messages))
+        return iter([_chunk("answer "), _chunk(str(len(self.requests)))])
+
+
+def test_render_agent_turn_keeps_history_manager_across_turns(app, monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(app, "get_openai_client", lambda api_key: client)
+    monkeypatch.setattr(app, "get_executor", lambda fingerprint, runtime: None)
+    runtime = RuntimeConfig(
+        openai_api_key="test",
+        model="test-model",
+        system_prompt="system",
+        timeout_seconds=5,
+        max_output_chars=1000,
+        servers={},
+    )
+    stats = HistoryStats()
+    history = HistoryManager(runtime.history_token_budget, runtime.tool_excerpt_chars, OutputStore(), stats)
+
+    transcript = app.render_agent_turn(runtime, "first", [], history)
+    transcript = app.render_agent_turn(runtime, "second", transcript, history)
+
+    assert [m["content"] for m in transcript] == ["first", "answer 1", "second", "answer 2"]
+    assert [m["content"] for m in client.requests[1]] == ["system", "first", "answer 1", "second"]
+    assert stats.last_tokens > 0
@@ -1,12 +1,18 @@
 import argparse
 import html
 import json
+import os
 import subprocess
 import sys
+import tempfile
+import time
 from io import BytesIO
 from pathlib import Path
 
 
+NAGIOS_STATUS_CODES = (1, 2, 3)
+
+
 class CommandResult:
     """Minimal subprocess result representation compatible with Python 3.6."""
 
@@ -117,6 +123,11 @@ def main():
         help="Output format",
     )
     parser.add_argument("--output", required=True, help="Output file path")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the health check and include per-stage timings in the report",
+    )
     parser.add_argument(
         "healthcheck_args",
         nargs=argparse.REMAINDER,
@@ -127,9 +138,32 @@ def main():
     extra_args = args.healthcheck_args
     if extra_args and extra_args[0] == "--":
         extra_args = extra_args[1:]
+    timings_path = None
+    if args.profile:
+        fd, timings_path = tempfile.mkstemp(prefix="healthcheck-profile-", suffix=".json")
+        os.close(fd)
+        extra_args = extra_args + ["--profile", "--profile-json", timings_path]
     cmd = [sys.executable, "middleware_healthcheck.py"] + extra_args
-    result = run_command(cmd)
-    if result.returncode != 0:
+
+    started = time.perf_counter()
+    try:
+        result = run_command(cmd)
+        healthcheck_seconds = time.perf_counter() - started
+        timings = None
+        if timings_path:
+            try:
+                timings = json.loads(Path(timings_path).read_text() or "null")
+            except ValueError:
+                timings = None
+    finally:
+        if timings_path:
+            os.remove(timings_path)
+
+    # With rules configured the health check exits with a Nagios status
+    # (1 warning, 2 critical, 3 unknown); those runs still produce a report.
+    if result.returncode != 0 and not (
+        result.returncode in NAGIOS_STATUS_CODES and "--- FINDINGS ---" in result.stdout
+    ):
         sys.stderr.write(result.stderr)
         sys.exit(result.returncode)
 
@@ -137,24 +171,43 @@ def main():
 
     lines = output.splitlines()
 
-    if args.format == "json":
+    started = time.perf_counter()
+    try:
+        _write_report(args.format, output, lines, args.output, timings)
+    finally:
+        if args.profile:
+            sys.stderr.write(
+                f"healthcheck {healthcheck_seconds * 1000:.1f} ms, "
+                f"report write {(time.perf_counter() - started) * 1000:.1f} ms\n"
+            )
+
+    if result.returncode:
+        sys.exit(result.returncode)
+
+
+def _write_report(report_format, output, lines, output_path, timings=None):
+    """Write the captured health-check output in the requested format."""
+
+    if report_format == "json":
         data = {"output": lines}
-        with open(args.output, "w") as f:
+        if timings is not None:
+            data["timings"] = timings
+        with open(output_path, "w") as f:
             json.dump(data, f, indent=2)
         return
 
-    if args.format == "html":
+    if report_format == "html":
         html_content = "<html><body><pre>" + html.escape(output) + "</pre></body></html>"
-        with open(args.output, "w") as f:
+        with open(output_path, "w") as f:
             f.write(html_content)
         return
 
-    if args.format == "pdf":
-        _write_pdf(lines, args.output)
+    if report_format == "pdf":
+        _write_pdf(lines, output_path)
         return
 
-    if args.format == "doc":
-        _write_doc(lines, args.output)
+    if report_format == "doc":
+        _write_doc(lines, output_path)
         return
 
 
@@ -0,0 +1,28 @@
+#!/usr/bin/env bash
+# Fail when a cpu+memory-only health check exceeds its cold-start budget.
+#
+# Usage: scripts/startup-budget.sh [budget-ms]   (RUNS and PYTHON may be overridden)
+set -euo pipefail
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+BUDGET_MS="${1:-400}"
+RUNS="${RUNS:-5}"
+PYTHON="${PYTHON:-python3}"
+
+best_ms=""
+for _ in $(seq "$RUNS"); do
+  start_ns=$(date +%s%N)
+  "$PYTHON" "$ROOT_DIR/middleware_healthcheck.py" --checks cpu,memory >/dev/null
+  elapsed_ms=$(( ($(date +%s%N) - start_ns) / 1000000 ))
+  if [[ -z "$best_ms" || "$elapsed_ms" -lt "$best_ms" ]]; then
+    best_ms="$elapsed_ms"
+  fi
+done
+
+if [[ "$best_ms" -gt "$BUDGET_MS" ]]; then
+  echo "Startup budget exceeded: best of $RUNS runs took ${best_ms}ms (budget ${BUDGET_MS}ms)" >&2
+  echo "Run with --startup-profile to see which imports are responsible." >&2
+  exit 1
+fi
+
+echo "Startup within budget: best of $RUNS runs took ${best_ms}ms (budget ${BUDGET_MS}ms)"
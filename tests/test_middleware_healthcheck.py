@@ -0,0 +1,94 @@
+from argparse import Namespace
+
+import pytest
+
+import middleware_healthcheck as hc
+
+
+def trend_args(tmp_path):
+    return Namespace(state_dir=str(tmp_path), admin_url='t3://admin:7001', trend_samples=None, trend_queue_limit=100)
+
+
+def test_trends_accept_list_shaped_results_and_slashes_in_names(tmp_path):
+    args = trend_args(tmp_path)
+
+    def results(heap, pending):
+        return {
+            'managed_servers': [{'name': 'soa/1', 'heapCurrent': heap, 'heapMax': 1000}],
+            'jms': [{'name': 'JMS/A', 'destinations': [{'name': 'mod!q/in', 'messagesCurrentCount': pending}]}],
+            'threads': [{'server': 'soa/1', 'throughput': 5, 'pendingUserRequestCount': pending}],
+        }
+
+    hc.analyze_trends(args, results(100, 10), now=0)
+    trends = hc.analyze_trends(args, results(200, 20), now=60)
+
+    server = trends['managed_servers']['soa/1']
+    assert (server['heapSlopePerMin'], server['minutesToHeapMax']) == (100.0, 8.0)
+    destination = trends['jms']['JMS/A']['mod!q/in']
+    assert (destination['pendingDelta'], destination['minutesToLimit']) == (10.0, 8.0)
+    assert trends['threads']['soa/1'] == {'throughputDelta': 0.0, 'pendingGrowthPerMin': 10.0}
+
+
+def test_rules_match_list_shaped_results():
+    rules = hc.compile_rules([
+        {'expr': 'threads.stuckThreadCount > 0', 'severity': 'critical'},
+        'datasource.*.activeConnectionsCurrentCount >= 10',
+    ])
+    results = {
+        'threads': [{'name': 'soa1', 'stuckThreadCount': 2}, {'name': 'soa2', 'stuckThreadCount': 0}],
+        'datasource': {'SOADataSource': [{'server': 'soa1', 'activeConnectionsCurrentCount': 12}]},
+    }
+
+    findings, evaluated = hc.evaluate_rules(rules, results)
+
+    assert evaluated == 3
+    assert [(finding['severity'], finding['entity']) for finding in findings] == [
+        ('critical', 'threads.soa1.stuckThreadCount'),
+        ('warning', 'datasource.SOADataSource.0.activeConnectionsCurrentCount'),
+    ]
+    assert hc.overall_severity(findings) == 'critical'
+
+
+def wlst_args(tmp_path, monkeypatch, stdout):
+    wlst = tmp_path / 'wlst.sh'
+    wlst.write_text(f"#!/bin/sh\necho '{stdout}'\nexit 1\n")
+    wlst.chmod(0o755)
+    admin_url = 't3://admin:7001'
+    monkeypatch.setattr(hc, '_BREAKER', None)
+    monkeypatch.setitem(hc._PREFLIGHT, admin_url, (True, None, None))
+    monkeypatch.setattr(hc, '_WLST_FAILURES', {})
+    return Namespace(
+        state_dir=str(tmp_path), admin_url=admin_url, username='weblogic', password='secret',
+        wlst_path=str(wlst), wlst_script=str(tmp_path / 'checks.py'), wlst_sample_output=None,
+    )
+
+
+def test_wlst_script_errors_do_not_open_the_circuit(tmp_path, monkeypatch):
+    args = wlst_args(tmp_path, monkeypatch, '{"error": "No attribute HeapSizeCurrent"}')
+    for _ in range(hc.BREAKER_THRESHOLD + 1):
+        assert hc._run_wlst('jms', args) is None
+
+    assert hc.circuit_breaker(args).open_until(args.admin_url) is None
+    assert hc._WLST_FAILURES['jms'][0] == 'error'
+
+
+def test_wlst_connect_errors_open_the_circuit(tmp_path, monkeypatch):
+    args = wlst_args(tmp_path, monkeypatch, '{"error": "Failed to connect via WLST: Connection refused"}')
+    for _ in range(hc.BREAKER_THRESHOLD):
+        hc._run_wlst('jms', args)
+
+    assert hc.circuit_breaker(args).open_until(args.admin_url) is not None
+
+
+def test_cpu_window_without_jiffies_is_not_reported_as_idle(tmp_path, monkeypatch):
+    stat = tmp_path / 'stat'
+    stat.write_text("cpu  100 0 50 800 10 0 0 5\ncpu0 100 0 50 800 10 0 0 5\n")
+    sampler = hc.CpuSampler(str(stat))
+    monkeypatch.setattr(hc, '_CPU_SAMPLER', sampler)
+    monkeypatch.setattr(hc.time, 'sleep', lambda seconds: pytest.fail('the CPU check slept'))
+
+    result = hc.check_os_cpu()
+
+    assert result['usage'] is None and 'clock tick' in result['reason']
+    stat.write_text("cpu  130 0 60 860 10 0 0 5\ncpu0 130 0 60 860 10 0 0 5\n")
+    assert hc.check_os_cpu()['usage'] == 40.0
@@ -15,15 +15,31 @@ automatically when the ``--wlst-sample-output`` option is supplied.
 
 import json
 import os
+import re
 import sys
+import time
 from datetime import datetime
 
+_STARTED = time.time()
+_TIMINGS = {}
+_MBEAN_STATS = {}
+
 try:
     from io import open as io_open
 except ImportError:  # pragma: no cover - Python 2 / Jython fallback
     io_open = open
 
 
+def timed(name, func, *args):
+    """Call ``func`` and add its wall-clock duration to ``_TIMINGS[name]``."""
+
+    started = time.time()
+    try:
+        return func(*args)
+    finally:
+        _TIMINGS[name] = _TIMINGS.get(name, 0.0) + (time.time() - started)
+
+
 def normalize_collections(value, current_key=None):
     """Convert list-based collections into dictionaries keyed by names."""
 
@@ -66,11 +82,169 @@ def next_key(prefix, container):
     return "{}_{}".format(prefix, count)
 
 
+SAMPLE_SECTIONS = {
+    'cluster': 'clusters',
+    'jms': 'jmsServers',
+    'datasource': 'datasources',
+    'deployments': 'deployments',
+    'composites': 'composites',
+    'managed_servers': 'servers',
+    'threads': 'threads',
+}
+
+_STRUCTURAL = re.compile(b'"[^"\\\\]*(?:\\\\.[^"\\\\]*)*"|["{}\\[\\]:,]')
+_STRING_END = re.compile(b'["\\\\]')
+_NESTED = re.compile(b'(?:[^"{}\\[\\]]|"[^"\\\\]*(?:\\\\.[^"\\\\]*)*")*(["{}\\[\\]])')
+
+
+def index_sample_sections(handle, chunk_size=65536):
+    """Map each top-level key of a JSON object to the byte range of its value.
+
+    The file is scanned in chunks without building any values, so memory use
+    stays flat however large the payload is. Returns None when the document
+    is not a JSON object.
+    """
+
+    sections = {}
+    depth = 0
+    in_string = False
+    escaped = False
+    key_parts = None
+    key = None
+    value_start = None
+    offset = 0
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            break
+        pos = 0
+        size = len(chunk)
+        while pos < size:
+            if escaped:
+                if key_parts is not None:
+                    key_parts.append(chunk[pos:pos + 1])
+                escaped = False
+                pos += 1
+            elif in_string:
+                match = _STRING_END.search(chunk, pos)
+                if not match:
+                    if key_parts is not None:
+                        key_parts.append(chunk[pos:])
+                    pos = size
+                    continue
+                if key_parts is not None:
+                    key_parts.append(chunk[pos:match.end()])
+                pos = match.end()
+                if chunk[match.start():pos] == b'\\':
+                    escaped = True
+                    continue
+                in_string = False
+                if key_parts is not None:
+                    key = json.loads(b''.join(key_parts).decode('utf-8'))
+                    key_parts = None
+            else:
+                # Below the top level only brackets matter, so skip straight to the next one.
+                match = _NESTED.match(chunk, pos) if depth > 1 else None
+                group = 1
+                if not match:
+                    match = _STRUCTURAL.search(chunk, pos)
+                    group = 0
+                if not match:
+                    pos = size
+                    continue
+                token = match.group(group)
+                at = offset + match.start(group)
+                pos = match.end()
+                if depth == 0 and token != b'{':
+                    return None
+                if token[:1] == b'"':
+                    expecting_key = depth == 1 and value_start is None
+                    if len(token) > 1:
+                        # Strings that end inside this chunk are skipped in one step.
+                        if expecting_key:
+                            key = json.loads(token.decode('utf-8'))
+                    else:
+                        in_string = True
+                        if expecting_key:
+                            key_parts = [token]
+                elif token in b'{[':
+                    depth += 1
+                elif token in b'}]':
+                    depth -= 1
+                    if depth == 0 and key is not None:
+                        sections[key] = [value_start, at]
+                        key = None
+                elif depth == 1 and token == b':':
+                    value_start = at + 1
+                elif depth == 1 and token == b',':
+                    sections[key] = [value_start, at]
+                    key = None
+                    value_start = None
+        offset += size
+    return sections if depth == 0 else None
+
+
+def _read_json_file(path, default):
+    try:
+        with open(path, 'r') as handle:
+            return json.load(handle)
+    except (IOError, OSError, ValueError):
+        return default
+
+
+def _write_json_file(path, data):
+    """Write ``data`` next to ``path`` and rename it into place."""
+
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'w') as handle:
+        json.dump(data, handle)
+    if os.path.exists(path) and os.name != 'posix':
+        os.remove(path)  # rename cannot replace files on Windows (or under Jython's 'java')
+    os.rename(temp_path, path)
+
+
+def sample_sections(path):
+    """Return the section index of ``path``, reusing its ``.index.json`` sidecar.
+
+    The sidecar is keyed by file size and modification time; it is rebuilt
+    when the sample changes and simply not written when the directory is
+    read-only.
+    """
+
+    stat = os.stat(path)
+    index_path = path + '.index.json'
+    cached = _read_json_file(index_path, {})
+    if cached.get('size') == stat.st_size and cached.get('mtime') == stat.st_mtime:
+        return cached.get('sections')
+
+    with io_open(path, 'rb') as handle:
+        sections = index_sample_sections(handle)
+    try:
+        _write_json_file(index_path, {'size': stat.st_size, 'mtime': stat.st_mtime, 'sections': sections})
+    except (IOError, OSError):
+        pass
+    return sections
+
+
+def read_sample_section(path, start, end):
+    with io_open(path, 'rb') as handle:
+        handle.seek(start)
+        return json.loads(handle.read(end - start).decode('utf-8'))
+
+
 def load_sample_payload(check):
     path = os.environ.get('WLST_SAMPLE_OUTPUT')
     if not path or not os.path.exists(path):
         return None
 
+    target_key = SAMPLE_SECTIONS.get(check)
+    if target_key:
+        sections = sample_sections(path) or {}
+        if target_key in sections:
+            start, end = sections[target_key]
+            section = read_sample_section(path, start, end)
+            return {target_key: normalize_collections(section, target_key)}
+
     try:
         with io_open(path, 'r', encoding='utf-8') as handle:
             payload = json.load(handle)
@@ -78,25 +252,7 @@ def load_sample_payload(check):
         with io_open(path, 'r') as handle:
             payload = json.load(handle)
 
-    payload = normalize_collections(payload)
-
-    if check == 'all' or check is None:
-        return payload
-
-    filtered = {}
-    key_map = {
-        'cluster': 'clusters',
-        'jms': 'jmsServers',
-        'datasource': 'datasources',
-        'deployments': 'deployments',
-        'composites': 'composites',
-        'managed_servers': 'servers',
-        'threads': 'threads',
-    }
-    target_key = key_map.get(check)
-    if target_key and target_key in payload:
-        filtered[target_key] = payload[target_key]
-    return filtered or payload
+    return normalize_collections(payload)
 
 
 def normalize_health_state(health):
@@ -135,30 +291,67 @@ def ensure_domain_runtime():
     return True
 
 
+def record_mbean_call(mbean_type, attribute, seconds, failed=False):
+    """Accumulate call count, errors, total and max latency per MBean attribute."""
+
+    by_attribute = _MBEAN_STATS.setdefault(mbean_type, {})
+    stats = by_attribute.get(attribute)
+    if stats is None:
+        stats = {'calls': 0, 'errors': 0, 'total': 0.0, 'max': 0.0}
+        by_attribute[attribute] = stats
+    stats['calls'] += 1
+    stats['total'] += seconds
+    if seconds > stats['max']:
+        stats['max'] = seconds
+    if failed:
+        stats['errors'] += 1
+
+
+def mbean_call(mbean, getter, mbean_type, default=None):
+    """Call ``mbean.<getter>()`` and record its latency under ``mbean_type``.
+
+    Returns ``default`` when the MBean is missing or does not expose the
+    getter; exceptions from the remote call propagate as before.
+    """
+
+    method = getattr(mbean, getter, None) if mbean is not None else None
+    if not callable(method):
+        return default
+    attribute = getter[3:] if getter.startswith('get') else getter
+    started = time.time()
+    failed = True
+    try:
+        result = method()
+        failed = False
+        return result
+    finally:
+        record_mbean_call(mbean_type, attribute, time.time() - started, failed)
+
+
 def fetch_clusters():  # pragma: no cover - WLST environment only
     clusters = {}
     try:
         ensure_domain_runtime()
-        runtimes = cmo.getClusterRuntimes()
+        runtimes = mbean_call(cmo, 'getClusterRuntimes', 'DomainRuntime')
         if runtimes:
             for runtime in runtimes:
-                name = getattr(runtime, 'getName', lambda: None)()
+                name = mbean_call(runtime, 'getName', 'ClusterRuntime')
                 cluster_info = {
                     'name': name,
-                    'state': getattr(runtime, 'getState', lambda: None)(),
+                    'state': mbean_call(runtime, 'getState', 'ClusterRuntime'),
                     'servers': {},
                 }
                 try:
-                    server_runtimes = getattr(runtime, 'getServerRuntimes', lambda: [])()
+                    server_runtimes = mbean_call(runtime, 'getServerRuntimes', 'ClusterRuntime', [])
                 except Exception:  # Some WLST versions expose getServers instead
-                    server_runtimes = getattr(runtime, 'getServers', lambda: [])()
+                    server_runtimes = mbean_call(runtime, 'getServers', 'ClusterRuntime', [])
                 for server in server_runtimes or []:
-                    health = getattr(server, 'getHealthState', lambda: None)()
-                    server_name = getattr(server, 'getName', lambda: None)()
+                    health = mbean_call(server, 'getHealthState', 'ServerRuntime')
+                    server_name = mbean_call(server, 'getName', 'ServerRuntime')
                     server_key = server_name or next_key('server', cluster_info['servers'])
                     cluster_info['servers'][server_key] = {
                         'name': server_name,
-                        'state': getattr(server, 'getState', lambda: None)(),
+                        'state': mbean_call(server, 'getState', 'ServerRuntime'),
                         'health': normalize_health_state(health),
                     }
                 key = name or next_key('cluster', clusters)
@@ -169,76 +362,263 @@ def fetch_clusters():  # pragma: no cover - WLST environment only
     return clusters
 
 
+def platform_attribute(connection, object_name, attribute):  # pragma: no cover - WLST environment only
+    """Read one attribute of a platform MXBean, timed like the MBean getters."""
+
+    started = time.time()
+    failed = True
+    try:
+        value = connection.getAttribute(object_name, attribute)
+        failed = False
+        return value
+    finally:
+        mbean_type = object_name.getKeyProperty('type') or 'PlatformMXBean'
+        record_mbean_call(mbean_type, attribute, time.time() - started, failed)
+
+
+def fetch_platform_jvm_metrics(server_name):  # pragma: no cover - WLST environment only
+    """Collect GC counters and process CPU load from a server's platform MXBeans.
+
+    The domain runtime MBean server federates each server's ``java.lang``
+    MXBeans under a ``Location=<server>`` key.
+    """
+
+    connection = globals().get('mbs')  # Provided by WLST at runtime
+    if connection is None or not server_name:
+        return {}
+    try:
+        from javax.management import ObjectName
+    except ImportError:
+        return {}
+
+    metrics = {}
+    try:
+        pattern = ObjectName('java.lang:type=GarbageCollector,Location={},*'.format(server_name))
+        collectors = {}
+        for object_name in connection.queryNames(pattern, None) or []:
+            collectors[object_name.getKeyProperty('name')] = {
+                'collectionCount': platform_attribute(connection, object_name, 'CollectionCount'),
+                'collectionTime': platform_attribute(connection, object_name, 'CollectionTime'),
+            }
+        if collectors:
+            metrics['gc'] = collectors
+    except Exception:
+        pass
+    try:
+        os_bean = ObjectName('java.lang:type=OperatingSystem,Location={}'.format(server_name))
+        load = platform_attribute(connection, os_bean, 'ProcessCpuLoad')
+        if load is not None and load >= 0:
+            metrics['processCpuLoad'] = load
+    except Exception:
+        pass
+    return metrics
+
+
+def fetch_jvm_metrics(server_name, jvm_runtime):  # pragma: no cover - WLST environment only
+    """Heap free percent, uptime, GC counters and process CPU load for one server."""
+
+    metrics = {}
+    for key, getter in (
+        ('heapFreePercent', 'getHeapFreePercent'),
+        ('heapFreeCurrent', 'getHeapFreeCurrent'),
+        ('uptime', 'getUptime'),
+    ):
+        try:
+            metrics[key] = mbean_call(jvm_runtime, getter, 'JVMRuntime')
+        except Exception:
+            metrics[key] = None
+    metrics.update(fetch_platform_jvm_metrics(server_name))
+    return metrics
+
+
 def fetch_managed_servers():  # pragma: no cover - WLST environment only
     servers = {}
     try:
         ensure_domain_runtime()
-        runtimes = cmo.getServerRuntimes()
+        runtimes = mbean_call(cmo, 'getServerRuntimes', 'DomainRuntime')
         for runtime in runtimes or []:
-            health = getattr(runtime, 'getHealthState', lambda: None)()
-            heap_runtime = getattr(runtime, 'getJVMRuntime', lambda: None)()
+            health = mbean_call(runtime, 'getHealthState', 'ServerRuntime')
+            heap_runtime = mbean_call(runtime, 'getJVMRuntime', 'ServerRuntime')
             heap_current = None
             heap_max = None
             if heap_runtime:
                 try:
-                    heap_current = heap_runtime.getHeapSizeCurrent()
-                    heap_max = heap_runtime.getHeapSizeMax()
+                    heap_current = mbean_call(heap_runtime, 'getHeapSizeCurrent', 'JVMRuntime')
                 except Exception:
-                    heap_current = heap_runtime.getHeapSizeCurrent() if hasattr(heap_runtime, 'getHeapSizeCurrent') else None
-                    heap_max = heap_runtime.getHeapSizeMax() if hasattr(heap_runtime, 'getHeapSizeMax') else None
-            name = runtime.getName() if hasattr(runtime, 'getName') else None
+                    heap_current = None
+                try:
+                    heap_max = mbean_call(heap_runtime, 'getHeapSizeMax', 'JVMRuntime')
+                except Exception:
+                    heap_max = None
+            name = mbean_call(runtime, 'getName', 'ServerRuntime')
             server_key = name or next_key('server', servers)
             servers[server_key] = {
                 'name': name,
-                'state': runtime.getState() if hasattr(runtime, 'getState') else None,
-                'cluster': getattr(runtime, 'getClusterName', lambda: None)(),
+                'state': mbean_call(runtime, 'getState', 'ServerRuntime'),
+                'cluster': mbean_call(runtime, 'getClusterName', 'ServerRuntime'),
                 'health': normalize_health_state(health),
-                'listenAddress': getattr(runtime, 'getListenAddress', lambda: None)(),
-                'listenPort': getattr(runtime, 'getListenPort', lambda: None)(),
+                'listenAddress': mbean_call(runtime, 'getListenAddress', 'ServerRuntime'),
+                'listenPort': mbean_call(runtime, 'getListenPort', 'ServerRuntime'),
                 'heapCurrent': heap_current,
                 'heapMax': heap_max,
             }
+            if heap_runtime:
+                servers[server_key].update(fetch_jvm_metrics(name, heap_runtime))
     except Exception as exc:
         error_key = next_key('server_error', servers)
         servers[error_key] = {'name': 'ERROR', 'state': str(exc)}
     return servers
 
 
+def thread_dump_settings():
+    """Read thread-dump capture settings from the environment (None = disabled)."""
+
+    directory = os.environ.get('WLST_THREAD_DUMP_DIR')
+    if not directory:
+        return None
+    env = os.environ.get
+    return {
+        'dir': directory,
+        'interval': float(env('WLST_THREAD_DUMP_INTERVAL') or 600),
+        'hogging': int(env('WLST_THREAD_DUMP_HOGGING') or 5),
+        'max_bytes': int(env('WLST_THREAD_DUMP_MAX_BYTES') or 2 * 1024 * 1024),
+        'max_total': int(env('WLST_THREAD_DUMP_MAX_TOTAL') or 100 * 1024 * 1024),
+    }
+
+
+def _prune_thread_dumps(directory, max_total, keep):
+    """Delete the oldest dumps until the directory fits in ``max_total`` bytes."""
+
+    dumps = []
+    for name in os.listdir(directory):
+        if name.endswith('.txt.gz'):
+            path = os.path.join(directory, name)
+            dumps.append((os.path.getmtime(path), os.path.getsize(path), path))
+    dumps.sort()
+    total = sum(item[1] for item in dumps)
+    for _, size, path in dumps:
+        if total <= max_total:
+            break
+        if path != keep:
+            os.remove(path)
+            total -= size
+
+
+def store_thread_dump(directory, text, max_bytes, max_total):
+    """Store ``text`` gzip-compressed under its SHA-256; identical dumps are kept once."""
+
+    import gzip
+    import hashlib
+
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    truncated = len(text) > max_bytes
+    if truncated:
+        text = text[:max_bytes]
+    digest = hashlib.sha256(text).hexdigest()
+    path = os.path.join(directory, digest + '.txt.gz')
+    deduplicated = os.path.exists(path)
+    if deduplicated:
+        os.utime(path, None)
+    else:
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            handle = gzip.open(temp_path, 'wb')
+            try:
+                handle.write(text)
+            finally:
+                handle.close()
+            os.rename(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    _prune_thread_dumps(directory, max_total, path)
+    return {
+        'sha256': digest,
+        'path': path,
+        'bytes': len(text),
+        'truncated': truncated,
+        'deduplicated': deduplicated,
+    }
+
+
+def maybe_capture_thread_dump(settings, server_name, server_runtime, entry):
+    """Capture a thread dump when a pool reports stuck or many hogging threads.
+
+    Captures are rate-limited per server through ``index.json`` in the dump
+    directory; the returned reference is embedded in the ``threads`` entry.
+    A failed capture or write is returned as ``{'error': ...}`` so the pool
+    metrics of every server are still reported.
+    """
+
+    if not settings or not server_name:
+        return None
+    stuck = entry.get('stuckThreadCount') or 0
+    hogging = entry.get('hoggingThreadCount') or 0
+    if stuck <= 0 and hogging < settings['hogging']:
+        return None
+    try:
+        return _capture_thread_dump(settings, server_name, server_runtime, stuck, hogging)
+    except Exception as exc:
+        return {'error': 'Thread dump failed: {}'.format(exc)}
+
+
+def _capture_thread_dump(settings, server_name, server_runtime, stuck, hogging):
+    directory = settings['dir']
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    index_path = os.path.join(directory, 'index.json')
+    index = _read_json_file(index_path, {})
+    now = time.time()
+    last = index.get(server_name) or {}
+    if last.get('capturedAt') and now - last['capturedAt'] < settings['interval']:
+        reference = dict(last)
+        reference['skipped'] = 'rate-limited'
+        return reference
+
+    jvm_runtime = mbean_call(server_runtime, 'getJVMRuntime', 'ServerRuntime')
+    text = mbean_call(jvm_runtime, 'getThreadStackDump', 'JVMRuntime')
+    if not text:
+        return {'error': 'Thread dump not available from the JVM runtime'}
+
+    reference = store_thread_dump(directory, text, settings['max_bytes'], settings['max_total'])
+    reference['capturedAt'] = now
+    reference['reason'] = 'stuck={} hogging={}'.format(stuck, hogging)
+    index[server_name] = reference
+    _write_json_file(index_path, index)
+    return reference
+
+
 def fetch_threads():  # pragma: no cover - WLST environment only
     thread_pools = {}
+    dump_settings = thread_dump_settings()
     try:
         ensure_domain_runtime()
-        runtimes = cmo.getServerRuntimes()
+        runtimes = mbean_call(cmo, 'getServerRuntimes', 'DomainRuntime')
         for runtime in runtimes or []:
-            name = getattr(runtime, 'getName', lambda: None)()
-            thread_runtime = getattr(runtime, 'getThreadPoolRuntime', lambda: None)()
+            name = mbean_call(runtime, 'getName', 'ServerRuntime')
+            thread_runtime = mbean_call(runtime, 'getThreadPoolRuntime', 'ServerRuntime')
             if not thread_runtime:
                 continue
-            entry = {
-                'server': name,
-                'executeThreadTotalCount': getattr(
-                    thread_runtime, 'getExecuteThreadTotalCount', lambda: None
-                )(),
-                'executeThreadIdleCount': getattr(
-                    thread_runtime, 'getExecuteThreadIdleCount', lambda: None
-                )(),
-                'pendingUserRequestCount': getattr(
-                    thread_runtime, 'getPendingUserRequestCount', lambda: None
-                )(),
-                'hoggingThreadCount': getattr(
-                    thread_runtime, 'getHoggingThreadCount', lambda: None
-                )(),
-                'stuckThreadCount': getattr(
-                    thread_runtime, 'getStuckThreadCount', lambda: None
-                )(),
-                'queueLength': getattr(thread_runtime, 'getQueueLength', lambda: None)(),
-            }
-            throughput = getattr(thread_runtime, 'getThroughput', None)
-            if callable(throughput):
+            entry = {'server': name}
+            for key, getter in (
+                ('executeThreadTotalCount', 'getExecuteThreadTotalCount'),
+                ('executeThreadIdleCount', 'getExecuteThreadIdleCount'),
+                ('pendingUserRequestCount', 'getPendingUserRequestCount'),
+                ('hoggingThreadCount', 'getHoggingThreadCount'),
+                ('stuckThreadCount', 'getStuckThreadCount'),
+                ('queueLength', 'getQueueLength'),
+            ):
+                entry[key] = mbean_call(thread_runtime, getter, 'ThreadPoolRuntime')
+            if callable(getattr(thread_runtime, 'getThroughput', None)):
                 try:
-                    entry['throughput'] = throughput()
+                    entry['throughput'] = mbean_call(thread_runtime, 'getThroughput', 'ThreadPoolRuntime')
                 except Exception:
                     entry['throughput'] = None
+            dump = maybe_capture_thread_dump(dump_settings, name, runtime, entry)
+            if dump:
+                entry['threadDump'] = dump
             pool_key = name or next_key('threadPool', thread_pools)
             thread_pools[pool_key] = entry
     except Exception as exc:
@@ -251,34 +631,38 @@ def fetch_jms_servers():  # pragma: no cover - WLST environment only
     servers = {}
     try:
         ensure_domain_runtime()
-        jms_runtime = getattr(cmo, 'getJMSRuntime', lambda: None)()
+        jms_runtime = mbean_call(cmo, 'getJMSRuntime', 'DomainRuntime')
         server_runtimes = []
         if jms_runtime:
-            server_runtimes = getattr(jms_runtime, 'getJMSServers', lambda: [])()
+            server_runtimes = mbean_call(jms_runtime, 'getJMSServers', 'JMSRuntime', [])
         elif hasattr(cmo, 'getJMSServers'):
-            server_runtimes = cmo.getJMSServers()
+            server_runtimes = mbean_call(cmo, 'getJMSServers', 'DomainRuntime')
         for runtime in server_runtimes or []:
-            health = getattr(runtime, 'getHealthState', lambda: None)()
+            health = mbean_call(runtime, 'getHealthState', 'JMSServerRuntime')
             destinations = {}
             try:
-                destination_runtimes = getattr(runtime, 'getDestinations', lambda: [])()
+                destination_runtimes = mbean_call(runtime, 'getDestinations', 'JMSServerRuntime', [])
             except Exception:
                 destination_runtimes = []
             for dest in destination_runtimes or []:
-                dest_name = getattr(dest, 'getName', lambda: None)()
+                dest_name = mbean_call(dest, 'getName', 'JMSDestinationRuntime')
                 dest_key = dest_name or next_key('destination', destinations)
                 destinations[dest_key] = {
                     'name': dest_name,
-                    'type': getattr(dest, 'getType', lambda: None)(),
-                    'messagesCurrentCount': getattr(dest, 'getMessagesCurrentCount', lambda: None)(),
-                    'messagesHighCount': getattr(dest, 'getMessagesHighCount', lambda: None)(),
-                    'consumersCurrentCount': getattr(dest, 'getConsumersCurrentCount', lambda: None)(),
+                    'type': mbean_call(dest, 'getType', 'JMSDestinationRuntime'),
+                    'messagesCurrentCount': mbean_call(
+                        dest, 'getMessagesCurrentCount', 'JMSDestinationRuntime'
+                    ),
+                    'messagesHighCount': mbean_call(dest, 'getMessagesHighCount', 'JMSDestinationRuntime'),
+                    'consumersCurrentCount': mbean_call(
+                        dest, 'getConsumersCurrentCount', 'JMSDestinationRuntime'
+                    ),
                 }
-            name = getattr(runtime, 'getName', lambda: None)()
+            name = mbean_call(runtime, 'getName', 'JMSServerRuntime')
             server_key = name or next_key('jmsServer', servers)
             servers[server_key] = {
                 'name': name,
-                'state': getattr(runtime, 'getState', lambda: None)(),
+                'state': mbean_call(runtime, 'getState', 'JMSServerRuntime'),
                 'health': normalize_health_state(health),
                 'destinations': destinations,
             }
@@ -288,20 +672,70 @@ def fetch_jms_servers():  # pragma: no cover - WLST environment only
     return servers
 
 
+JDBC_POOL_METRICS = (
+    ('activeConnectionsCurrentCount', 'getActiveConnectionsCurrentCount'),
+    ('activeConnectionsHighCount', 'getActiveConnectionsHighCount'),
+    ('currCapacity', 'getCurrCapacity'),
+    ('numAvailable', 'getNumAvailable'),
+    ('waitingForConnectionCurrentCount', 'getWaitingForConnectionCurrentCount'),
+    ('waitingForConnectionHighCount', 'getWaitingForConnectionHighCount'),
+    ('waitSecondsHighCount', 'getWaitSecondsHighCount'),
+    ('leakedConnectionCount', 'getLeakedConnectionCount'),
+    ('connectionDelayTime', 'getConnectionDelayTime'),
+    ('failedReserveRequestCount', 'getFailedReserveRequestCount'),
+)
+
+
+def fetch_datasource_max_capacity():  # pragma: no cover - WLST environment only
+    """Map data source names to the configured pool ``MaxCapacity``.
+
+    The runtime MBeans do not expose the pool limit, so it is read once per
+    data source from the domain configuration.
+    """
+
+    capacities = {}
+    try:
+        domain = mbean_call(cmo, 'getDomainConfiguration', 'DomainRuntime')
+        for resource in mbean_call(domain, 'getJDBCSystemResources', 'Domain', []) or []:
+            jdbc = mbean_call(resource, 'getJDBCResource', 'JDBCSystemResource')
+            params = mbean_call(jdbc, 'getJDBCConnectionPoolParams', 'JDBCDataSourceBean')
+            capacities[mbean_call(resource, 'getName', 'JDBCSystemResource')] = mbean_call(
+                params, 'getMaxCapacity', 'JDBCConnectionPoolParams'
+            )
+    except Exception:
+        pass
+    return capacities
+
+
 def fetch_datasources():  # pragma: no cover - WLST environment only
     datasources = {}
     try:
         ensure_domain_runtime()
-        service = cmo.getJDBCServiceRuntime()
-        if service:
-            for runtime in service.getJDBCDataSourceRuntimeMBeans():
-                name = runtime.getName()
+        max_capacity = fetch_datasource_max_capacity()
+        runtimes = mbean_call(cmo, 'getServerRuntimes', 'DomainRuntime')
+        for server_runtime in runtimes or []:
+            server_name = mbean_call(server_runtime, 'getName', 'ServerRuntime')
+            service = mbean_call(server_runtime, 'getJDBCServiceRuntime', 'ServerRuntime')
+            if not service:
+                continue
+            for runtime in mbean_call(service, 'getJDBCDataSourceRuntimeMBeans', 'JDBCServiceRuntime', []):
+                name = mbean_call(runtime, 'getName', 'JDBCDataSourceRuntime')
+                pool = {'state': mbean_call(runtime, 'getState', 'JDBCDataSourceRuntime')}
+                for key, getter in JDBC_POOL_METRICS:
+                    pool[key] = mbean_call(runtime, getter, 'JDBCDataSourceRuntime')
+                pool['maxCapacity'] = max_capacity.get(name)
+
                 datasource_key = name or next_key('datasource', datasources)
-                datasources[datasource_key] = {
+                entry = datasources.setdefault(datasource_key, {
                     'name': name,
-                    'state': runtime.getState(),
-                    'activeConnectionsCurrentCount': runtime.getActiveConnectionsCurrentCount(),
-                }
+                    'state': pool['state'],
+                    'activeConnectionsCurrentCount': 0,
+                    'servers': {},
+                })
+                if pool['state'] != 'Running':
+                    entry['state'] = pool['state']
+                entry['activeConnectionsCurrentCount'] += pool['activeConnectionsCurrentCount'] or 0
+                entry['servers'][server_name or next_key('server', entry['servers'])] = pool
     except Exception as exc:
         error_key = next_key('datasource_error', datasources)
         datasources[error_key] = {'name': 'ERROR', 'state': str(exc)}
@@ -312,14 +746,14 @@ def fetch_deployments():  # pragma: no cover - WLST environment only
     deployments = {}
     try:
         ensure_domain_runtime()
-        runtime = cmo.lookupAppRuntimeStateRuntime()
+        runtime = mbean_call(cmo, 'lookupAppRuntimeStateRuntime', 'DomainRuntime')
         if runtime:
-            for app in runtime.getAppDeploymentStateRuntimes():
-                name = app.getName()
+            for app in mbean_call(runtime, 'getAppDeploymentStateRuntimes', 'AppRuntimeStateRuntime', []):
+                name = mbean_call(app, 'getName', 'AppDeploymentStateRuntime')
                 deployment_key = name or next_key('deployment', deployments)
                 deployments[deployment_key] = {
                     'name': name,
-                    'state': app.getState(),
+                    'state': mbean_call(app, 'getState', 'AppDeploymentStateRuntime'),
                 }
     except Exception as exc:
         error_key = next_key('deployment_error', deployments)
@@ -332,7 +766,11 @@ def fetch_composites():  # pragma: no cover - WLST environment only
     try:
         soa = globals().get('soa_cluster_state')
         if soa:
-            composites_list = soa()  # Custom hook provided by customer WLST scripts
+            started = time.time()
+            try:
+                composites_list = soa()  # Custom hook provided by customer WLST scripts
+            finally:
+                record_mbean_call('SOAComposite', 'soa_cluster_state', time.time() - started)
         else:
             composites_list = []
         for composite in composites_list:
@@ -355,7 +793,7 @@ def fetch_composites():  # pragma: no cover - WLST environment only
 
 
 def gather(check, username, password, admin_url):
-    sample_payload = load_sample_payload(check)
+    sample_payload = timed('load_sample', load_sample_payload, check)
     if sample_payload is not None and not sample_payload:
         return normalize_collections(sample_payload)
     if sample_payload:
@@ -363,37 +801,26 @@ def gather(check, username, password, admin_url):
         sample_payload['source'] = 'sample'
         return normalize_collections(sample_payload)
 
-    if not connect_if_available(username, password, admin_url):
+    if not timed('connect', connect_if_available, username, password, admin_url):
         return normalize_collections(
             {'error': 'WLST runtime not available and no sample payload supplied'}
         )
 
-    if check == 'cluster':
-        return normalize_collections({'clusters': fetch_clusters()})
-    if check == 'managed_servers':
-        return normalize_collections({'servers': fetch_managed_servers()})
-    if check == 'jms':
-        return normalize_collections({'jmsServers': fetch_jms_servers()})
-    if check == 'threads':
-        return normalize_collections({'threads': fetch_threads()})
-    if check == 'datasource':
-        return normalize_collections({'datasources': fetch_datasources()})
-    if check == 'deployments':
-        return normalize_collections({'deployments': fetch_deployments()})
-    if check == 'composites':
-        return normalize_collections({'composites': fetch_composites()})
-
-    return normalize_collections(
-        {
-            'clusters': fetch_clusters(),
-            'servers': fetch_managed_servers(),
-            'jmsServers': fetch_jms_servers(),
-            'threads': fetch_threads(),
-            'datasources': fetch_datasources(),
-            'deployments': fetch_deployments(),
-            'composites': fetch_composites(),
-        }
-    )
+    fetchers = [
+        ('cluster', 'clusters', fetch_clusters),
+        ('managed_servers', 'servers', fetch_managed_servers),
+        ('jms', 'jmsServers', fetch_jms_servers),
+        ('threads', 'threads', fetch_threads),
+        ('datasource', 'datasources', fetch_datasources),
+        ('deployments', 'deployments', fetch_deployments),
+        ('composites', 'composites', fetch_composites),
+    ]
+    selected = [item for item in fetchers if item[0] == check] or fetchers
+
+    payload = {}
+    for _, key, fetcher in selected:
+        payload[key] = timed(fetcher.__name__, fetcher)
+    return normalize_collections(payload)
 
 
 def main():
@@ -406,6 +833,12 @@ def main():
     if 'generatedAt' not in payload:
         payload['generatedAt'] = datetime.utcnow().isoformat() + 'Z'
     payload.setdefault('check', check)
+    if os.environ.get('WLST_PROFILE'):
+        timings = dict(_TIMINGS)
+        timings['total'] = time.time() - _STARTED
+        payload['_timings'] = timings
+    if os.environ.get('WLST_STATS'):
+        payload['_stats'] = _MBEAN_STATS
 
     print(json.dumps(payload))
 